@@ -1,40 +1,83 @@
-import subprocess
-import json
+import os
 import sys
-from flask import Flask, request, jsonify, render_template_string
-from linkedin_scraper import scrape_linkedin_profile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, request, jsonify, render_template_string, Response, stream_with_context
+from linkedin_scraper import get_scraper_service
+from scrape_scheduler import ScrapeQueueFull
+from jobs import JobManager, JobQueueFull
+from profile_cache import scrape_with_cache, get_profile_cache
+from candidate_store import get_candidate_store, SEARCH_PAGE_SIZE
+from automate_chrome import DASHBOARD_URL
+from automation_worker import dispatch_prompt
+from prompt_template import CompiledTemplate, TemplateLoader, PromptTemplateError
+from profile_model import Profile, dumps
+from prompt_budget import PROMPT_TOKEN_BUDGET, compact_experiences, estimate_tokens, tokens_for_chars
+from static_page import LazyStaticPage
+from metrics import time_stage, observe_stage, render_metrics, PROMPT_TOKENS
+from log_setup import setup_logging, console, VERBOSE_CONSOLE
 import logging
 
-logging.basicConfig(
-    filename='scrape.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Queued JSON logs in scrape.log (app) and access.log (Werkzeug), rotated and gzipped
+setup_logging()
 
 app = Flask(__name__)
+job_manager = JobManager()
 
-def format_linkedin_data_for_prompt(profile_data, job_title, base_prompt):
+# Batch submission limits (override with environment variables)
+BATCH_PARALLELISM = int(os.environ.get("BATCH_PARALLELISM", "2"))
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "100"))
+
+# Scheduler lanes a batch may use; interactive is reserved for the dashboard
+BATCH_LANES = ("batch", "background")
+
+# How long a job's automation_guard waits for a supervisor-triggered Chrome
+# restart to finish before the paste is given up (seconds)
+BROWSER_RESTART_WAIT = float(os.environ.get("BROWSER_RESTART_WAIT", "90"))
+
+# Idle interval after which a job event stream sends a keepalive comment
+SSE_KEEPALIVE_SECONDS = float(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+
+def _experience_block(idx, exp, detail):
+    return f"""
+{idx}. {exp.designation or 'N/A'} at {exp.company or 'N/A'}
+   Duration: {exp.duration or 'N/A'}
+   Details: {detail or 'No details available'}
+"""
+
+def format_linkedin_data_for_prompt(profile_data, job_title, base_prompt, budget=PROMPT_TOKEN_BUDGET, report=None):
     """
     Function to format LinkedIn scraped data and inject it into the base prompt
     
     Args:
-        profile_data (dict): LinkedIn profile data from scraper
+        profile_data (Profile | dict): LinkedIn profile from the scraper or cache
         job_title (str): Job title the candidate is applying for
-        base_prompt (str): Base interview prompt template
+        base_prompt (CompiledTemplate | str): Base interview prompt template
+        budget (int): Estimated tokens allowed for the candidate section; experience
+            details are cleaned up and ranked to fit (0 keeps them verbatim)
+        report (dict): Optional dict that receives `original_tokens`, `compacted_tokens`,
+            `original_chars`, `compacted_chars` and `roles_omitted` for the candidate section
     
     Returns:
         str: Formatted prompt with LinkedIn data injected
+
+    Raises:
+        PromptTemplateError: if the template lacks the Client data / Job Title placeholders
     """
-    try:
-        # Extract individual parts from profile data
-        name = profile_data.get("name", "Name not found")
-        bio = profile_data.get("bio", "Bio not found")
-        experiences = profile_data.get("experiences", [])
-        education = profile_data.get("education", [])
-        skills = profile_data.get("skills", [])
-        
-        # Format client data section
-        client_data_section = f"""
+    if isinstance(base_prompt, str):
+        base_prompt = CompiledTemplate(base_prompt)
+    if isinstance(profile_data, dict):
+        profile_data = Profile.from_dict(profile_data)
+
+    # Extract individual parts from profile data
+    name = profile_data.name
+    bio = profile_data.bio
+    experiences = profile_data.experiences
+    education = profile_data.education
+    skills = profile_data.skills
+    
+    # Format client data section
+    header = f"""
 CANDIDATE PROFILE:
 ==================
 Name: {name}
@@ -43,55 +86,188 @@ Bio/Summary: {bio}
 
 Work Experience:
 """
-        
-        # Add experiences
+    
+    # Education and skills are short and always kept in full
+    tail = []
+    if education:
+        tail.append("\nEducation:\n")
+        for idx, edu in enumerate(education, 1):
+            tail.append(f"{idx}. {edu.degree or 'N/A'} - {edu.school or 'N/A'} ({edu.duration or 'N/A'})\n")
+    
+    # Add skills if available
+    if skills:
+        tail.append(f"\nSkills: {', '.join(skills[:10])}")  # Limit to first 10 skills
+        if len(skills) > 10:
+            tail.append(f" and {len(skills) - 10} more...")
+    tail = "".join(tail)
+    
+    # Add experiences, fitted into what the budget leaves after the rest
+    parts = [header]
+    omitted = 0
+    if experiences and budget > 0:
+        kept, omitted = compact_experiences(
+            experiences, job_title, budget - estimate_tokens(header) - estimate_tokens(tail)
+        )
+    else:
+        kept = [(exp, exp.detail) for exp in experiences]
+    for idx, (exp, detail) in enumerate(kept, 1):
+        parts.append(_experience_block(idx, exp, detail))
+    if omitted:
+        parts.append(f"\n({omitted} more roles not shown)\n")
+    if not experiences:
+        parts.append("\nNo work experience found.\n")
+    parts.append(tail)
+    client_data = "".join(parts)
+
+    # Report what the verbatim section would have cost next to what is sent
+    if budget > 0 or report is not None:
         if experiences:
-            for idx, exp in enumerate(experiences, 1):
-                designation = exp.get('designation', 'N/A')
-                company = exp.get('company', 'N/A')
-                duration = exp.get('duration', 'N/A')
-                detail = exp.get('detail', 'No details available')
-                
-                client_data_section += f"""
-{idx}. {designation} at {company}
-   Duration: {duration}
-   Details: {detail}
-"""
+            original_chars = len(header) + len(tail) + sum(
+                len(_experience_block(idx, exp, exp.detail)) for idx, exp in enumerate(experiences, 1)
+            )
         else:
-            client_data_section += "\nNo work experience found.\n"
-        
-        # Add education if available
-        if education:
-            client_data_section += "\nEducation:\n"
-            for idx, edu in enumerate(education, 1):
-                degree = edu.get('degree', 'N/A')
-                school = edu.get('school', 'N/A')
-                duration = edu.get('duration', 'N/A')
-                client_data_section += f"{idx}. {degree} - {school} ({duration})\n"
-        
-        # Add skills if available
-        if skills:
-            client_data_section += f"\nSkills: {', '.join(skills[:10])}"  # Limit to first 10 skills
-            if len(skills) > 10:
-                client_data_section += f" and {len(skills) - 10} more..."
-        
-        # Replace placeholders in the base prompt
-        formatted_prompt = base_prompt.replace(
-            "Client data=  \n`\n`", 
-            f"Client data=  \n`{client_data_section}\n`"
-        )
-        
-        formatted_prompt = formatted_prompt.replace(
-            "Job Title= \n`\n`", 
-            f"Job Title= \n`{job_title}\n`"
-        )
-        
-        return formatted_prompt
-        
-    except Exception as e:
-        print(f"Error formatting LinkedIn data: {e}")
-        logging.error(f"Error formatting LinkedIn data: {e}")
-        return base_prompt  # Return original prompt if formatting fails
+            original_chars = len(client_data)
+        sizes = {
+            "original_tokens": tokens_for_chars(original_chars),
+            "compacted_tokens": estimate_tokens(client_data),
+            "original_chars": original_chars,
+            "compacted_chars": len(client_data),
+            "roles_omitted": omitted,
+        }
+        PROMPT_TOKENS.observe(sizes["original_tokens"], kind="original")
+        PROMPT_TOKENS.observe(sizes["compacted_tokens"], kind="compacted")
+        if report is not None:
+            report.update(sizes)
+    
+    # Fill the placeholders of the compiled prompt in a single pass
+    return base_prompt.render(client_data=client_data, job_title=job_title)
+
+# Default interview prompt used when paste.txt is not present
+DEFAULT_BASE_PROMPT = """
+""Can you start by introducing yourself—your academic background and your most recent role or internship?"
+
+"Also, what inspired you to apply for the [Job Title] position with us?"
+
+🧠 Experience & Relevance to the [Job Title]
+
+"Looking at your role at [Last Company Name from resume], how do you think that prepared you for a [Job Title] position?"
+
+"You worked on [key task or responsibility from resume]. Could you explain how that might relate to what you'd be doing in this role?"
+
+"You’ve listed skills like [skills from resume related to JD]. Could you share an example where you applied one of them to solve a real problem?"
+
+🎓 Education & Applied Knowledge
+
+"You studied [Degree Name] at [University Name]. How have you applied what you learned to any real-world projects or jobs?"
+
+"I see you took courses like [Relevant Course 1] and [Course 2]—how did those help shape your understanding of the kind of work you'd do as a [Job Title]?"
+
+🔍 Resume-Based Project Inquiry
+
+"You worked on a project called [Project Name from resume]. That sounds interesting—what specific challenges did you face in that, and how did you tackle them?"
+
+"I noticed your work on [second project or internship]—how is that experience relevant to the kind of goals we have for our [Job Title] role?"
+
+(If multiple projects are present, rotate between them in a follow-up.)
+
+🎯 Role-Specific Scenarios for [Job Title]
+
+Ask 2–3 relevant questions from this list, adapting to the role:
+
+If [Job Title] = Sales Manager or Business Development:
+
+"Tell me about a time you exceeded your sales target. What did you do differently?"
+
+"How do you typically build and retain long-term client relationships?"
+
+If [Job Title] = Software Engineer / Developer / Technical:
+
+"You mentioned using tools like [Tool/Language from resume]—what’s your favorite stack and why?"
+
+"Walk me through a technical challenge you faced recently and how you resolved it."
+
+If [Job Title] = Teacher / Student Affairs / Academic:
+
+"How do you engage students or participants in your sessions?"
+
+"Have you ever managed a tough classroom or learning situation? What was your approach?"
+
+If [Job Title] = Support / Admin / Customer-Facing:
+
+"How do you typically calm down a frustrated client or customer?"
+
+"Can you describe a time you had to respond quickly under pressure?"
+
+If [Job Title] = Arts / Creative / Design:
+
+"Your project/work on [Creative project from resume] is quite unique. What inspired that?"
+
+"How do you balance creative freedom with client or brand guidelines?"
+
+If [Job Title] = Banking / Finance:
+
+"How do you ensure accuracy in reporting or transaction handling?"
+
+"Tell me about a high-pressure financial decision or situation you've been involved in."
+
+🤝 Soft Skills & Team Fit
+
+"You’ve listed leadership roles like [leadership role from resume]—what did you learn from those experiences?"
+
+"How do you usually deal with deadlines and multitasking?"
+
+"Do you prefer solo work or team-based environments? Can you share a quick example?"
+
+(Short positive reinforcement is okay: “That’s a good balance,” or “Sounds like you collaborate well.”)
+
+🗓️ Availability & Practical Questions
+
+"Are you currently working or available to join immediately?"
+
+"What are your salary expectations for this position?"
+
+"Are you open to relocation or working remotely if required?"
+
+📌 Wrap-Up and Next Steps
+
+"Thank you for sharing your insights."
+
+"Based on the experience and the role of [Job Title], our company’s budget range is PKR 80k to 120k."
+
+"We’ll now forward your profile to the hiring manager. If shortlisted, you’ll hear back from us within 2–3 business days."
+
+🙏 Closing
+
+"Thanks again for your time today. We appreciate your interest in joining our team. Have a great day!"
+
+⚙️ System Instructions for the Interview Bot
+Dynamically replace [Job Title] with provided input.
+
+Extract resume fields like: name, education, last job title, projects, tools/technologies, leadership roles, and certifications.
+
+Ask questions based on resume highlights and job relevance.
+
+React only to spoken content—ignore any background noise or voices unless the candidate themselves is speaking.
+
+If candidate doesn’t respond, do not interrupt. Wait or prompt gently:
+“Let me know when you're ready to continue.”
+
+"
+
+Client data=  
+`
+`
+
+Job Title= 
+`
+`"""
+
+# Compiled base prompt, recompiled only when paste.txt changes on disk
+prompt_templates = TemplateLoader('paste.txt', DEFAULT_BASE_PROMPT)
+
+def load_base_prompt():
+    """Return the compiled base interview prompt from paste.txt, or the built-in default"""
+    return prompt_templates.get()
 
 # Your HTML template as a string (keeping the same as before)
 HTML_TEMPLATE = '''
@@ -413,6 +589,74 @@ HTML_TEMPLATE = '''
             }, 100);
         }
 
+        // Poll a queued job until it finishes
+        async function waitForJob(jobUrl) {
+            while (true) {
+                const response = await fetch(jobUrl);
+                const job = await response.json();
+                console.log("🔵 Job status:", job.status, job.stage);
+
+                if (job.status === 'success' || job.status === 'error') {
+                    return job;
+                }
+
+                submitBtn.textContent = `Working (${job.stage})...`;
+                await new Promise(resolve => setTimeout(resolve, 1000));
+            }
+        }
+
+        // Progress messages for the job's server-sent events
+        const PROGRESS_MESSAGES = {
+            scrape_started: () => '🔎 Opening LinkedIn profile...',
+            profile_basics: (data) => `👤 Found ${data.name}${data.bio ? ' — ' + data.bio : ''}`,
+            experiences: (data) => `💼 ${data.experiences.length} experience entries extracted${data.complete === false ? ', loading the rest...' : ''}`,
+            education: (data) => `🎓 ${data.education.length} education entries extracted`,
+            skills: (data) => `🛠️ ${data.skills.length} skills extracted${data.complete === false ? ', loading the rest...' : ''}`,
+            prompt_formatted: (data) => `📝 Interview prompt ready${data.compacted_tokens < data.original_tokens ? ` (candidate section ~${data.compacted_tokens} of ${data.original_tokens} tokens)` : ''}`,
+            automation_dispatched: () => '🤖 Sending prompt to the assistant...',
+            paste_confirmed: () => '✅ Prompt pasted into the assistant',
+            paste_failed: () => '⚠️ Prompt paste could not be confirmed',
+        };
+
+        // Follow a queued job over server-sent events, falling back to polling
+        function streamJob(eventsUrl, jobUrl) {
+            if (!window.EventSource) {
+                return waitForJob(jobUrl);
+            }
+            return new Promise((resolve) => {
+                const source = new EventSource(eventsUrl);
+                let finished = false;
+
+                Object.keys(PROGRESS_MESSAGES).forEach((name) => {
+                    source.addEventListener(name, (e) => {
+                        const event = JSON.parse(e.data);
+                        console.log(`🔵 ${name} at ${event.elapsed}s`, event.data);
+                        showStatus(`${PROGRESS_MESSAGES[name](event.data)} (${event.elapsed.toFixed(1)}s)`, 'success');
+                        submitBtn.textContent = `Working (${event.stage})...`;
+                    });
+                });
+                source.addEventListener('done', (e) => {
+                    finished = true;
+                    source.close();
+                    resolve({ status: 'success', result: JSON.parse(e.data).data.result });
+                });
+                source.addEventListener('error', (e) => {
+                    if (e.data) {
+                        finished = true;
+                        source.close();
+                        resolve({ status: 'error', error: JSON.parse(e.data).data.message });
+                        return;
+                    }
+                    // Connection problem: let polling finish the job instead
+                    if (!finished) {
+                        finished = true;
+                        source.close();
+                        resolve(waitForJob(jobUrl));
+                    }
+                });
+            });
+        }
+
         // Handle form submission
         form.addEventListener('submit', async (e) => {
             e.preventDefault();
@@ -444,8 +688,15 @@ HTML_TEMPLATE = '''
                 
                 console.log("🔵 Response status:", response.status);
                 
-                const data = await response.json();
+                let data = await response.json();
                 console.log("🔵 Server response:", data);
+
+                if (data.status === 'queued') {
+                    const job = await streamJob(data.events_url, data.job_url);
+                    data = job.status === 'success'
+                        ? { status: 'success', ...job.result }
+                        : { status: 'error', message: job.error };
+                }
                 
                 if (data.status === 'success') {
                     showStatus('✅ Data submitted successfully! Starting interview...', 'success');
@@ -526,9 +777,117 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+# The dashboard page has no per-request data: render it once, serve it cached
+dashboard_page = LazyStaticPage(lambda: render_template_string(HTML_TEMPLATE))
+
 @app.route('/')
 def home():
-    return render_template_string(HTML_TEMPLATE)
+    return dashboard_page.get().response(request)
+
+
+def record_automation_metrics(automation):
+    """Feed the worker-side selector and paste timings into the stage histograms"""
+    paste = automation.get("paste") or {}
+    if paste.get("resolve_ms") is not None:
+        observe_stage("selector_resolve", paste["resolve_ms"] / 1000)
+    if paste.get("attempts"):
+        observe_stage("paste_confirm", paste["latency_ms"] / 1000)
+
+def run_interview_setup(job, linkedin_url, job_title, refresh=False, bypass=False):
+    """
+    Background pipeline for one interview: scrape -> format -> automation
+
+    Args:
+        job (Job): Job used to report the current stage and its timings
+        linkedin_url (str): LinkedIn profile URL to scrape
+        job_title (str): Job title the candidate is applying for
+        refresh (bool): Re-scrape even if the profile is cached
+        bypass (bool): Skip the profile cache entirely
+
+    Returns:
+        dict: Result payload exposed on /jobs/<id>
+    """
+    # Scrape LinkedIn profile data, streaming partial results to /jobs/<id>/events
+    job.emit("scrape_started", url=linkedin_url)
+    with job.track("scrape"):
+        profile_data, cache_status = scrape_with_cache(
+            linkedin_url, refresh=refresh, bypass=bypass, timings=job.timings,
+            on_progress=lambda event, data: job.emit(event, **data)
+        )
+    console(f"🗄️ CACHE: {cache_status}")
+    if cache_status == "hit":
+        # No scrape ran, so nothing was streamed yet
+        job.emit("profile_basics", name=profile_data.name, bio=profile_data.bio, cached=True)
+        for key in ("experiences", "education", "skills"):
+            job.emit(key, **{key: getattr(profile_data, key), "complete": True, "cached": True})
+
+    logging.info(f"NAME: {profile_data.name}", extra={
+        "cache": cache_status, "experiences": len(profile_data.experiences)
+    })
+
+    # Dump the profile to the console (one write, skipped with VERBOSE_CONSOLE=0)
+    if VERBOSE_CONSOLE:
+        lines = [f"👤 NAME: {profile_data.name}", f"\n📝 BIO: {profile_data.bio}", "\n💼 EXPERIENCES:"]
+        for idx, exp in enumerate(profile_data.experiences, 1):
+            lines.append(f"  {idx}. {exp.designation or 'N/A'} at {exp.company or 'N/A'}")
+            lines.append(f"     Duration: {exp.duration or 'N/A'}")
+            lines.append(f"     Detail: {exp.detail or 'No details'}\n")
+        if not profile_data.experiences:
+            lines.append("  No experience data found.")
+        lines.append("=" * 50 + "\n")
+        console("\n".join(lines))
+
+    # Keep the candidate searchable after the job is gone; never fail the interview over it
+    try:
+        with time_stage("candidate_store"):
+            get_candidate_store().record(profile_data, linkedin_url, job_title, job_id=job.id)
+    except Exception as e:
+        console(f"⚠️ Could not store candidate: {e}")
+        logging.warning(f"CANDIDATE STORE ERROR for {linkedin_url}: {e}")
+
+    # Format the LinkedIn data into the prompt
+    prompt_size = {}
+    with job.track("format"):
+        base_prompt = load_base_prompt()
+        with time_stage("format"):
+            formatted_prompt = format_linkedin_data_for_prompt(
+                profile_data, job_title, base_prompt, report=prompt_size
+            )
+    job.emit("prompt_formatted", length=len(formatted_prompt), **prompt_size)
+    logging.info(f"PROMPT: {len(formatted_prompt)} chars", extra={"prompt_size": prompt_size})
+
+    console(f"📝 FORMATTED PROMPT READY (candidate section ~{prompt_size['compacted_tokens']} "
+            f"of {prompt_size['original_tokens']} tokens)")
+    console("🤖 Sending prompt to Chrome automation...")
+
+    # Waits out a Chrome restart in progress, then holds off new ones until the
+    # paste is done, so the supervisor never closes Chrome under a paste
+    with get_scraper_service().supervisor.automation_guard(BROWSER_RESTART_WAIT), job.track("automation"):
+        # Hand this job's prompt to the automation worker directly; no shared
+        # file, so concurrent interviews can't overwrite each other's prompt
+        with time_stage("automation_dispatch"):
+            automation = dispatch_prompt({
+                "job_id": job.id,
+                "url": DASHBOARD_URL,
+                "prompt": formatted_prompt,
+                "job_title": job_title,
+                "candidate_name": profile_data.name
+            }, on_ack=lambda ack: job.emit("automation_dispatched", queue_position=ack.get("queue_position")))
+    # The dashboard tab is the app's own; the supervisor may close older ones
+    get_scraper_service().supervisor.track_dashboard(automation.get("dashboard_target"))
+    job.emit("paste_confirmed" if automation.get("status") == "success" else "paste_failed",
+             automation=automation)
+    record_automation_metrics(automation)
+    console(f"🤖 AUTOMATION: {automation.get('status')} - {automation.get('message')}")
+
+    return {
+        "message": "Profile scraped successfully! Chrome automation ran with LinkedIn data.",
+        "profile": profile_data,
+        "cache": cache_status,
+        "prompt_size": prompt_size,
+        "automation": automation,
+        "formatted_prompt_preview": formatted_prompt[:500] + "..." if len(formatted_prompt) > 500 else formatted_prompt
+    }
 
 @app.route('/submit', methods=['POST', 'OPTIONS'])
 def handle_submit():
@@ -539,197 +898,280 @@ def handle_submit():
         data = request.get_json()
         linkedin_url = data.get('linkedin', '')
         job_title = data.get('resumeName', '')
+        refresh = bool(data.get('refresh', False))
+        bypass = bool(data.get('bypassCache', False))
+
+        console(f"📎 LINKEDIN URL: {linkedin_url}\n📄 JOB TITLE: {job_title}\n" + "=" * 50)
+        logging.info(f"LINKEDIN URL: {linkedin_url}", extra={"job_title": job_title})
+
+        if not linkedin_url:
+            return jsonify({
+                "status": "error",
+                "message": "A LinkedIn URL is required"
+            }), 400
+
+        # Turn the submit away now rather than failing the job once it starts
+        if get_scraper_service().scheduler.is_full("interactive"):
+            raise ScrapeQueueFull("Too many interactive scrapes waiting, try again later")
+
+        # Hand the slow browser work to the background pool and answer right away
+        job = job_manager.submit(
+            linkedin_url, run_interview_setup, linkedin_url, job_title,
+            refresh=refresh, bypass=bypass
+        )
+        logging.info(f"JOB QUEUED: {job.id}", extra={"job_id": job.id})
 
-        print(f"📎 LINKEDIN URL: {linkedin_url}")
-        logging.info(f"LINKEDIN URL: {linkedin_url}")
-
-        print(f"📄 JOB TITLE: {job_title}")
-        print("=" * 50)
-
-        # Scrape LinkedIn profile data
-        profile_data = scrape_linkedin_profile(linkedin_url)
-
-        # Extract and print individual parts
-        name = profile_data.get("name", "Name not found")
-        bio = profile_data.get("bio", "Bio not found")
-        experiences = profile_data.get("experiences", [])
-
-        print(f"👤 NAME: {name}")
-        logging.info(f"NAME: {name}")
-        print(f"\n📝 BIO: {bio}")
-        print("\n💼 EXPERIENCES:")
-        if experiences:
-            for idx, exp in enumerate(experiences, 1):
-                print(f"  {idx}. {exp.get('designation', 'N/A')} at {exp.get('company', 'N/A')}")
-                print(f"     Duration: {exp.get('duration', 'N/A')}")
-                print(f"     Detail: {exp.get('detail', 'No details')}\n")
-        else:
-            print("  No experience data found.")
-
-        print("=" * 50 + "\n")
-
-        # Read the base interview prompt from paste.txt
-        try:
-            with open('paste.txt', 'r', encoding='utf-8') as f:
-                base_prompt = f.read()
-        except FileNotFoundError:
-            print("❌ Warning: paste.txt not found. Using default prompt.")
-            base_prompt = """
-""Can you start by introducing yourself—your academic background and your most recent role or internship?"
-
-"Also, what inspired you to apply for the [Job Title] position with us?"
-
-🧠 Experience & Relevance to the [Job Title]
-
-"Looking at your role at [Last Company Name from resume], how do you think that prepared you for a [Job Title] position?"
-
-"You worked on [key task or responsibility from resume]. Could you explain how that might relate to what you'd be doing in this role?"
-
-"You’ve listed skills like [skills from resume related to JD]. Could you share an example where you applied one of them to solve a real problem?"
-
-🎓 Education & Applied Knowledge
-
-"You studied [Degree Name] at [University Name]. How have you applied what you learned to any real-world projects or jobs?"
-
-"I see you took courses like [Relevant Course 1] and [Course 2]—how did those help shape your understanding of the kind of work you'd do as a [Job Title]?"
-
-🔍 Resume-Based Project Inquiry
-
-"You worked on a project called [Project Name from resume]. That sounds interesting—what specific challenges did you face in that, and how did you tackle them?"
-
-"I noticed your work on [second project or internship]—how is that experience relevant to the kind of goals we have for our [Job Title] role?"
-
-(If multiple projects are present, rotate between them in a follow-up.)
-
-🎯 Role-Specific Scenarios for [Job Title]
-
-Ask 2–3 relevant questions from this list, adapting to the role:
-
-If [Job Title] = Sales Manager or Business Development:
-
-"Tell me about a time you exceeded your sales target. What did you do differently?"
-
-"How do you typically build and retain long-term client relationships?"
-
-If [Job Title] = Software Engineer / Developer / Technical:
-
-"You mentioned using tools like [Tool/Language from resume]—what’s your favorite stack and why?"
-
-"Walk me through a technical challenge you faced recently and how you resolved it."
-
-If [Job Title] = Teacher / Student Affairs / Academic:
-
-"How do you engage students or participants in your sessions?"
-
-"Have you ever managed a tough classroom or learning situation? What was your approach?"
-
-If [Job Title] = Support / Admin / Customer-Facing:
-
-"How do you typically calm down a frustrated client or customer?"
-
-"Can you describe a time you had to respond quickly under pressure?"
-
-If [Job Title] = Arts / Creative / Design:
-
-"Your project/work on [Creative project from resume] is quite unique. What inspired that?"
-
-"How do you balance creative freedom with client or brand guidelines?"
-
-If [Job Title] = Banking / Finance:
-
-"How do you ensure accuracy in reporting or transaction handling?"
-
-"Tell me about a high-pressure financial decision or situation you've been involved in."
-
-🤝 Soft Skills & Team Fit
-
-"You’ve listed leadership roles like [leadership role from resume]—what did you learn from those experiences?"
-
-"How do you usually deal with deadlines and multitasking?"
-
-"Do you prefer solo work or team-based environments? Can you share a quick example?"
-
-(Short positive reinforcement is okay: “That’s a good balance,” or “Sounds like you collaborate well.”)
-
-🗓️ Availability & Practical Questions
-
-"Are you currently working or available to join immediately?"
-
-"What are your salary expectations for this position?"
-
-"Are you open to relocation or working remotely if required?"
-
-📌 Wrap-Up and Next Steps
-
-"Thank you for sharing your insights."
-
-"Based on the experience and the role of [Job Title], our company’s budget range is PKR 80k to 120k."
-
-"We’ll now forward your profile to the hiring manager. If shortlisted, you’ll hear back from us within 2–3 business days."
-
-🙏 Closing
-
-"Thanks again for your time today. We appreciate your interest in joining our team. Have a great day!"
-
-⚙️ System Instructions for the Interview Bot
-Dynamically replace [Job Title] with provided input.
-
-Extract resume fields like: name, education, last job title, projects, tools/technologies, leadership roles, and certifications.
+        return jsonify({
+            "status": "queued",
+            "message": "Interview setup queued. Poll the job URL for progress.",
+            "job_id": job.id,
+            "job_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events"
+        }), 202
+
+    except (JobQueueFull, ScrapeQueueFull) as e:
+        console(f"⚠️ QUEUE FULL: {e}")
+        logging.warning(f"QUEUE FULL: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 503
 
-Ask questions based on resume highlights and job relevance.
+    except Exception as e:
+        console(f"❌ ERROR: {e}")
+        logging.error(f"ERROR: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
 
-React only to spoken content—ignore any background noise or voices unless the candidate themselves is speaking.
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown job: {job_id}"
+        }), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/events')
+def stream_job_events(job_id):
+    """Server-sent events for one job: every stage event so far, then live ones until it ends"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown job: {job_id}"
+        }), 404
 
-If candidate doesn’t respond, do not interrupt. Wait or prompt gently:
-“Let me know when you're ready to continue.”
+    # EventSource sends the last id it saw when it reconnects
+    try:
+        seq = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        seq = 0
+
+    # A reconnect after the terminal event has nothing left to send; 204 tells
+    # EventSource to stop retrying
+    if job.finished and not job.events_since(seq, timeout=0):
+        return '', 204
+
+    def generate():
+        nonlocal seq
+        while True:
+            events = job.events_since(seq, timeout=SSE_KEEPALIVE_SECONDS)
+            if not events:
+                if job.finished:
+                    return
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                seq = event["seq"]
+                yield f"id: {seq}\nevent: {event['event']}\ndata: {dumps(event)}\n\n"
+            if job.finished:
+                return
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/metrics')
+def metrics():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/browser/stats')
+def browser_stats():
+    return jsonify(get_scraper_service().supervisor.last_sample or {})
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(get_profile_cache().stats())
+
+@app.route('/candidates/search')
+def search_candidates():
+    """Search stored candidates: ?q=&company=&name=&job_title=&page=&per_page="""
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', SEARCH_PAGE_SIZE))
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "page and per_page must be integers"
+        }), 400
+
+    start = time.perf_counter()
+    with time_stage("candidate_search"):
+        results = get_candidate_store().search(
+            text=request.args.get('q', ''),
+            company=request.args.get('company', ''),
+            name=request.args.get('name', ''),
+            job_title=request.args.get('job_title', ''),
+            page=page,
+            per_page=per_page
+        )
+    results["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(results)
 
-"
+def scrape_batch_candidate(index, candidate, base_prompt, refresh=False, priority="batch"):
+    """
+    Scrape and format one candidate of a batch; errors are returned, not raised
 
-Client data=  
-`
-`
+    Args:
+        index (int): Position of the candidate in the submitted list
+        candidate (dict): {"linkedin": ..., "resumeName": ...}
+        base_prompt (CompiledTemplate): Base interview prompt template
+        refresh (bool): Re-scrape even if the profile is cached
+        priority (str): Scheduler lane, "batch" or "background"
 
-Job Title= 
-`
-`
-"""
+    Returns:
+        dict: One NDJSON result line
+    """
+    linkedin_url = candidate.get('linkedin', '')
+    job_title = candidate.get('resumeName', '')
+    result = {"index": index, "linkedin": linkedin_url, "resumeName": job_title}
+    timings = {}
+    start = time.perf_counter()
 
-        # Format the LinkedIn data into the prompt
-        formatted_prompt = format_linkedin_data_for_prompt(profile_data, job_title, base_prompt)
+    try:
+        if not linkedin_url:
+            raise ValueError("A LinkedIn URL is required")
+        profile_data, cache_status = scrape_with_cache(
+            linkedin_url, refresh=refresh, timings=timings, priority=priority
+        )
+        prompt_size = {}
+        with time_stage("format"):
+            formatted_prompt = format_linkedin_data_for_prompt(
+                profile_data, job_title, base_prompt, report=prompt_size
+            )
+        result.update({
+            "status": "success",
+            "cache": cache_status,
+            "profile": profile_data,
+            "formatted_prompt": formatted_prompt,
+            "prompt_size": prompt_size,
+        })
+        logging.info(f"BATCH [{index}] NAME: {profile_data.name}", extra={"cache": cache_status, "timings": dict(timings)})
+    except Exception as e:
+        logging.error(f"BATCH [{index}] ERROR for {linkedin_url}: {e}")
+        result.update({"status": "error", "message": str(e)})
 
-        print("📝 FORMATTED PROMPT READY")
-        print("🤖 Starting Chrome automation...")
+    result["timings"] = timings
+    result["elapsed"] = round(time.perf_counter() - start, 3)
+    return result
 
-        # Save the formatted prompt to a temporary file for the automation script
-        with open('formatted_prompt.txt', 'w', encoding='utf-8') as f:
-            f.write(formatted_prompt)
+@app.route('/submit/batch', methods=['POST', 'OPTIONS'])
+def handle_submit_batch():
+    if request.method == 'OPTIONS':
+        return '', 200
 
-        # Trigger the automation script with parameters
-        # Pass the formatted prompt text as a command line argument
-        subprocess.Popen([
-            "python", 
-            "automate_chrome.py", 
-            "--linkedin-data", json.dumps(profile_data),
-            "--job-title", job_title,
-            "--prompt-file", "formatted_prompt.txt"
-        ])
+    data = request.get_json(silent=True)
+    candidates = data if isinstance(data, list) else (data or {}).get('candidates')
+    if not isinstance(candidates, list) or not candidates:
+        return jsonify({
+            "status": "error",
+            "message": "Send a non-empty list of {linkedin, resumeName} candidates"
+        }), 400
+    if len(candidates) > MAX_BATCH_SIZE:
+        return jsonify({
+            "status": "error",
+            "message": f"At most {MAX_BATCH_SIZE} candidates per batch"
+        }), 400
 
+    options = data if isinstance(data, dict) else {}
+    refresh = bool(options.get('refresh', False))
+    priority = options.get('priority', 'batch')
+    if priority not in BATCH_LANES:
         return jsonify({
-            "status": "success",
-            "message": "Profile scraped successfully! Chrome automation started with LinkedIn data.",
-            "profile": profile_data,
-            "formatted_prompt_preview": formatted_prompt[:500] + "..." if len(formatted_prompt) > 500 else formatted_prompt
-        })
+            "status": "error",
+            "message": f"priority must be one of {', '.join(BATCH_LANES)}"
+        }), 400
+    try:
+        parallelism = int(options.get('parallelism', BATCH_PARALLELISM))
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": "error",
+            "message": "parallelism must be an integer"
+        }), 400
+    # More workers than scraper tabs would only queue on the tab pool
+    parallelism = max(1, min(parallelism, get_scraper_service().pool_size, len(candidates)))
 
-    except Exception as e:
-        print(f"❌ ERROR: {e}")
-        logging.error(f"ERROR: {e}")
+    try:
+        base_prompt = load_base_prompt()
+    except (OSError, ValueError, PromptTemplateError) as e:
+        logging.error(f"BATCH: could not load the base prompt: {e}")
         return jsonify({
             "status": "error",
-            "message": str(e)
+            "message": f"Could not load the base prompt: {e}"
         }), 500
+    console(f"📦 BATCH: {len(candidates)} candidates, parallelism {parallelism}")
+    logging.info(f"BATCH: {len(candidates)} candidates, parallelism {parallelism}")
+
+    def generate():
+        start = time.perf_counter()
+        succeeded = 0
+        executor = ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="batch")
+        try:
+            futures = [
+                executor.submit(
+                    scrape_batch_candidate, idx, candidate if isinstance(candidate, dict) else {},
+                    base_prompt, refresh, priority
+                )
+                for idx, candidate in enumerate(candidates)
+            ]
+            # Stream each candidate as soon as it finishes
+            for future in as_completed(futures):
+                result = future.result()
+                succeeded += result["status"] == "success"
+                yield dumps(result) + "\n"
+
+            yield dumps({
+                "status": "done",
+                "total": len(candidates),
+                "succeeded": succeeded,
+                "failed": len(candidates) - succeeded,
+                "elapsed": round(time.perf_counter() - start, 3)
+            }) + "\n"
+        finally:
+            # Client went away or we finished: don't start scrapes nobody will read
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 if __name__ == '__main__':
     print("🚀 Flask server starting...")
     print("📍 Open your browser and go to: http://127.0.0.1:5000")
+
+    # Open scraper tabs ahead of the first request (only in the reloader's serving process)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        try:
+            get_scraper_service().warm_up()
+            console("🔥 Scraper tabs warmed up")
+        except Exception as e:
+            console(f"⚠️ Could not warm up scraper tabs: {e}")
+            logging.warning(f"Could not warm up scraper tabs: {e}")
+
+        # Keep the shared Chrome's tabs and memory in check (pastes hold off restarts
+        # through the supervisor's automation guard)
+        get_scraper_service().supervisor.start()
+
     app.run(debug=True, port=5000, host='127.0.0.1')
\ No newline at end of file
@@ -1,199 +1,451 @@
 import argparse
 import json
+import os
 import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
+from automation_stats import get_selector_cache, get_paste_stats
 
-def force_paste_text(driver, textarea, text):
-    """Multiple aggressive methods to force paste text"""
-    
+# Assistant dashboard the prompt is pasted into
+DASHBOARD_URL = "https://dashboard.vapi.ai/v2/assistants/94e635ef-eb8f-40e0-b1b6-3958d91241da"
+
+# Chrome started with --remote-debugging-port=9222
+CHROME_DEBUGGER_ADDRESS = "127.0.0.1:9222"
+
+# Candidate selectors for the system prompt textarea, in default priority order
+TEXTAREA_SELECTORS = [
+    'textarea[data-testid="system-prompt-textarea"]',
+    'textarea[placeholder*="system"]',
+    'textarea[placeholder*="prompt"]',
+    '[data-testid="system-prompt-textarea"]',
+    '#system-prompt',
+]
+
+# Generic selectors that match other elements too; used only when none of the
+# specific ones matched by the timeout, and never learned as the preferred one
+TEXTAREA_FALLBACK_SELECTORS = [
+    'textarea',
+    '.system-prompt',
+]
+
+# How long the page gets to render a matching element (seconds)
+SELECTOR_TIMEOUT = 20
+
+# Checks every specific selector in priority order inside the page and waits
+# (via a MutationObserver) until one matches a visible, enabled element. The
+# fallbacks are only tried once the timeout expires; their index counts on
+# from the end of the specific list.
+RESOLVE_SELECTORS_SCRIPT = """
+var selectors = arguments[0];
+var fallbacks = arguments[1];
+var timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function usable(el) {
+    return el.getClientRects().length > 0 && !el.disabled;
+}
+
+function find(list, offset) {
+    for (var i = 0; i < list.length; i++) {
+        var el = document.querySelector(list[i]);
+        if (el && usable(el)) return [offset + i, el];
+    }
+    return null;
+}
+
+var found = find(selectors, 0);
+if (found) return done(found);
+
+var observer = new MutationObserver(function() {
+    var match = find(selectors, 0);
+    if (match) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(match);
+    }
+});
+observer.observe(document.documentElement, { childList: true, subtree: true, attributes: true });
+var timer = setTimeout(function() {
+    observer.disconnect();
+    done(find(selectors, 0) || find(fallbacks, selectors.length) || [-1, null]);
+}, timeoutMs);
+"""
+
+def resolve_element(driver, url, selectors, timeout=SELECTOR_TIMEOUT, fallbacks=()):
+    """
+    Find the first usable element among `selectors` in a single page round trip
+
+    Selectors are ordered by what worked on this target before, and the winner
+    and its resolve time are recorded for next time. `fallbacks` keep their
+    order, are only used when no selector matched within `timeout`, and are
+    never learned, so a generic match can't push out the specific selectors.
+
+    Args:
+        driver (WebDriver): Driver on the target page
+        url (str): Target page URL used as the learning key
+        selectors (list): Candidate CSS selectors
+        timeout (float): Seconds to wait for any selector to match
+        fallbacks (list): Generic CSS selectors tried after the timeout
+
+    Returns:
+        WebElement: The matched element, or None if nothing matched in time
+    """
+    cache = get_selector_cache()
+    ordered = cache.order(url, selectors)
+    fallbacks = list(fallbacks)
+
+    driver.set_script_timeout(timeout + 5)
+    start = time.perf_counter()
+    index, element = driver.execute_async_script(
+        RESOLVE_SELECTORS_SCRIPT, ordered, fallbacks, int(timeout * 1000)
+    )
+    resolve_ms = (time.perf_counter() - start) * 1000
+
+    winner = (ordered + fallbacks)[index] if index >= 0 else None
+    fallback = index >= len(ordered)
+    cache.record(url, winner, resolve_ms, fallback=fallback)
+
+    if winner and fallback:
+        print(f"⚠️ Only the generic selector {winner} matched ({resolve_ms:.0f} ms)")
+    elif winner:
+        print(f"✅ Found element with selector: {winner} ({resolve_ms:.0f} ms)")
+    else:
+        print(f"❌ No selector matched within {timeout}s")
+    return element
+
+# How long a paste method gets to show its text in the textarea (seconds)
+PASTE_CONFIRM_TIMEOUT = 3
+
+# A paste counts when at least this share of the text landed in the textarea
+PASTE_MIN_RATIO = 0.9
+
+# Sets the value through the native setter (so React-style value tracking
+# sees the change), fires the usual events and reports the resulting length.
+# The text arrives as a script argument rather than being inlined in the source.
+JS_INJECT_SCRIPT = """
+var textarea = arguments[0];
+var text = arguments[1];
+
+textarea.focus();
+var setter = Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set;
+setter.call(textarea, text);
+
+['input', 'change', 'keyup', 'keydown', 'paste'].forEach(function(eventType) {
+    textarea.dispatchEvent(new Event(eventType, { bubbles: true, cancelable: true }));
+});
+textarea.dispatchEvent(new InputEvent('input', { bubbles: true, cancelable: true, data: text }));
+
+return textarea.value.length;
+"""
+
+# Resolves with the textarea length as soon as an input event (or the current
+# value) shows at least minLength characters, or when the timeout expires
+WAIT_FOR_VALUE_SCRIPT = """
+var textarea = arguments[0];
+var minLength = arguments[1];
+var timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+
+if (textarea.value.length >= minLength) return done(textarea.value.length);
+
+function finish() {
+    textarea.removeEventListener('input', onInput);
+    clearTimeout(timer);
+    done(textarea.value.length);
+}
+function onInput() {
+    if (textarea.value.length >= minLength) finish();
+}
+textarea.addEventListener('input', onInput);
+var timer = setTimeout(finish, timeoutMs);
+"""
+
+FIRE_EVENTS_SCRIPT = """
+var textarea = arguments[0];
+['input', 'change', 'blur', 'focus'].forEach(function(eventType) {
+    textarea.dispatchEvent(new Event(eventType, { bubbles: true }));
+});
+"""
+
+def wait_for_value(driver, textarea, min_length, timeout=PASTE_CONFIRM_TIMEOUT):
+    """Wait in the page for the textarea to hold `min_length` characters; returns its length"""
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(WAIT_FOR_VALUE_SCRIPT, textarea, min_length, int(timeout * 1000))
+
+def paste_js_inject(driver, textarea, text):
+    """Direct JavaScript value setting with comprehensive events"""
+    result_length = driver.execute_script(JS_INJECT_SCRIPT, textarea, text)
+    return result_length >= len(text) * PASTE_MIN_RATIO
+
+def paste_clipboard(driver, textarea, text):
+    """Copy to the system clipboard and paste with Ctrl+V"""
+    import pyperclip
+
+    pyperclip.copy(text)
+    if len(pyperclip.paste()) < len(text) * PASTE_MIN_RATIO:
+        print("⚠️ Clipboard copy incomplete")
+        return False
+
+    textarea.click()
+    textarea.send_keys(Keys.CONTROL + "a")
+    textarea.send_keys(Keys.CONTROL + "v")
+
+    if wait_for_value(driver, textarea, int(len(text) * PASTE_MIN_RATIO)) < len(text) * PASTE_MIN_RATIO:
+        return False
+    driver.execute_script(FIRE_EVENTS_SCRIPT, textarea)
+    return True
+
+def paste_action_chains(driver, textarea, text):
+    """Type the text through ActionChains in chunks"""
+    actions = ActionChains(driver)
+    actions.click(textarea).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
+
+    chunk_size = 500
+    for i in range(0, len(text), chunk_size):
+        ActionChains(driver).send_keys(text[i:i + chunk_size]).perform()
+
+    return wait_for_value(driver, textarea, int(len(text) * PASTE_MIN_RATIO)) >= len(text) * PASTE_MIN_RATIO
+
+# Brute force only types the start of the prompt; typing all of it takes too long
+BRUTE_FORCE_CHARS = 1000
+
+def paste_brute_force(driver, textarea, text):
+    """Type the first BRUTE_FORCE_CHARS characters directly (partial, last resort)"""
+    textarea.click()
+    textarea.send_keys(Keys.CONTROL + "a")
+    textarea.send_keys(text[:BRUTE_FORCE_CHARS])
+
+    if wait_for_value(driver, textarea, 500) > 500:
+        print("⚠️ Note: Only partial text due to size limitations")
+        return True
+    return False
+
+# Paste methods in default order; the engine reorders them per target from history
+PASTE_STRATEGIES = {
+    "js_inject": paste_js_inject,
+    "clipboard": paste_clipboard,
+    "action_chains": paste_action_chains,
+    "brute_force": paste_brute_force,
+}
+
+def force_paste_text(driver, textarea, text, target=None):
+    """
+    Paste `text` into `textarea`, trying the historically fastest method first
+
+    Each method's success and latency are recorded per target page, and the
+    next call orders methods by expected time to a successful paste.
+
+    Args:
+        driver (WebDriver): Driver on the target page
+        textarea (WebElement): Element to paste into
+        text (str): Text to paste
+        target (str): Learning key; defaults to the driver's current URL
+
+    Returns:
+        str: Name of the first method that succeeded, or None if all failed
+    """
     print(f"🎯 Attempting to paste {len(text)} characters...")
-    
-    # Method 1: Direct JavaScript value setting with comprehensive events
-    try:
-        print("🚀 Method 1: Direct JavaScript injection...")
-        
-        # Use JSON.stringify to properly escape the text
-        escaped_text = json.dumps(text)
-        
-        script = f"""
-        var textarea = arguments[0];
-        var text = {escaped_text};
-        
-        // Focus the element
-        textarea.focus();
-        
-        // Set the value
-        textarea.value = text;
-        
-        // Create and dispatch all possible events
-        var events = ['input', 'change', 'keyup', 'keydown', 'paste'];
-        events.forEach(function(eventType) {{
-            var event = new Event(eventType, {{ bubbles: true, cancelable: true }});
-            textarea.dispatchEvent(event);
-        }});
-        
-        // Also try InputEvent
-        var inputEvent = new InputEvent('input', {{ 
-            bubbles: true, 
-            cancelable: true,
-            data: text 
-        }});
-        textarea.dispatchEvent(inputEvent);
-        
-        // Force a blur and focus to trigger validation
-        textarea.blur();
-        setTimeout(function() {{ textarea.focus(); }}, 100);
-        
-        return textarea.value.length;
-        """
-        
-        result_length = driver.execute_script(script, textarea)
-        
-        if result_length > len(text) * 0.9:
-            print(f"✅ Method 1 SUCCESS: {result_length} characters set!")
-            return True
-            
-    except Exception as e:
-        print(f"❌ Method 1 failed: {e}")
-    
-    # Method 2: Clipboard with multiple attempts
-    try:
-        print("📋 Method 2: Enhanced clipboard method...")
-        import pyperclip
-        
-        # Clear clipboard first
-        pyperclip.copy("")
-        time.sleep(0.1)
-        
-        # Copy our text
-        pyperclip.copy(text)
-        time.sleep(0.2)
-        
-        # Verify clipboard
-        clipboard_content = pyperclip.paste()
-        if len(clipboard_content) < len(text) * 0.9:
-            print("⚠️ Clipboard copy incomplete, trying again...")
-            pyperclip.copy(text)
-            time.sleep(0.5)
-        
-        # Multiple paste attempts
-        for attempt in range(3):
-            print(f"📝 Paste attempt {attempt + 1}/3...")
-            
-            # Click and focus
-            textarea.click()
-            time.sleep(0.3)
-            
-            # Select all
-            textarea.send_keys(Keys.CONTROL + "a")
-            time.sleep(0.2)
-            
-            # Paste using Ctrl+V
-            textarea.send_keys(Keys.CONTROL + "v")
-            time.sleep(0.5)
-            
-            # Check if it worked
-            current_value = textarea.get_attribute('value')
-            if len(current_value) > len(text) * 0.9:
-                print(f"✅ Method 2 SUCCESS on attempt {attempt + 1}: {len(current_value)} characters!")
-                
-                # Trigger events manually
-                driver.execute_script("""
-                    var textarea = arguments[0];
-                    ['input', 'change', 'blur', 'focus'].forEach(function(eventType) {
-                        var event = new Event(eventType, { bubbles: true });
-                        textarea.dispatchEvent(event);
-                    });
-                """, textarea)
-                
-                return True
-                
-        print("❌ Method 2: All paste attempts failed")
-        
-    except Exception as e:
-        print(f"❌ Method 2 failed: {e}")
-    
-    # Method 3: Selenium ActionChains
-    try:
-        print("⚡ Method 3: ActionChains approach...")
-        
-        actions = ActionChains(driver)
-        
-        # Click, select all, and send text
-        actions.click(textarea).perform()
-        time.sleep(0.2)
-        
-        actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-        time.sleep(0.2)
-        
-        # Send text in smaller chunks
-        chunk_size = 500
-        text_chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-        
-        for i, chunk in enumerate(text_chunks):
-            print(f"📦 Sending chunk {i+1}/{len(text_chunks)}...")
-            actions.send_keys(chunk).perform()
-            time.sleep(0.1)
-        
-        # Verify
-        current_value = textarea.get_attribute('value')
-        if len(current_value) > len(text) * 0.9:
-            print(f"✅ Method 3 SUCCESS: {len(current_value)} characters!")
-            return True
-            
-    except Exception as e:
-        print(f"❌ Method 3 failed: {e}")
-    
-    # Method 4: Brute force character by character (last resort)
-    try:
-        print("💪 Method 4: Brute force character input...")
-        
-        textarea.click()
-        time.sleep(0.2)
-        textarea.send_keys(Keys.CONTROL + "a")
-        time.sleep(0.2)
-        
-        # Send first 1000 characters to test
-        test_chunk = text[:1000]
-        textarea.send_keys(test_chunk)
-        time.sleep(0.5)
-        
-        current_value = textarea.get_attribute('value')
-        if len(current_value) > 500:
-            print(f"✅ Method 4 partial SUCCESS: {len(current_value)} characters!")
-            print("⚠️ Note: Only partial text due to size limitations")
+
+    stats = get_paste_stats()
+    target = target or driver.current_url
+
+    for name in stats.order(target, list(PASTE_STRATEGIES)):
+        print(f"🚀 Paste method: {name}...")
+        start = time.perf_counter()
+        try:
+            success = PASTE_STRATEGIES[name](driver, textarea, text)
+        except Exception as e:
+            print(f"❌ {name} failed: {e}")
+            success = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats.record(target, name, success, elapsed_ms)
+
+        if success:
+            print(f"✅ {name} SUCCESS in {elapsed_ms:.0f} ms")
+            return name
+
+    return None
+
+# Paste attempts before giving up on a dashboard that keeps discarding the text
+PASTE_ATTEMPTS = 10
+
+# The value must stay unchanged this long to count as persisted (seconds)
+PERSIST_QUIET_PERIOD = float(os.environ.get("PASTE_QUIET_PERIOD", "1.5"))
+
+# Upper bound on the whole persistence confirmation (seconds)
+PERSIST_TIMEOUT = float(os.environ.get("PASTE_PERSIST_TIMEOUT", "10"))
+
+# Confirmation outcomes that mean the dashboard kept the text. "timeout" is only
+# reported while the value still matches (the page kept firing edits until the
+# wait ran out), so pasting again would change nothing.
+PERSISTED_OUTCOMES = ("stable", "dirty", "timeout")
+
+# Optional selector for the dashboard's save/dirty indicator; when it changes
+# after the paste, the app has registered the new prompt
+DIRTY_INDICATOR_SELECTOR = os.environ.get("DASHBOARD_DIRTY_SELECTOR", "")
+
+# Resolves once the textarea still holds the text after a quiet period with no
+# edits, as soon as the dirty indicator changes, or when the timeout expires.
+# Edits are noticed through input/change events and DOM mutations, not polling.
+CONFIRM_PERSISTENCE_SCRIPT = """
+var textarea = arguments[0];
+var text = arguments[1];
+var quietMs = arguments[2];
+var timeoutMs = arguments[3];
+var dirtySelector = arguments[4];
+var done = arguments[arguments.length - 1];
+var start = performance.now();
+var finished = false;
+
+function indicatorState() {
+    if (!dirtySelector) return null;
+    var el = document.querySelector(dirtySelector);
+    return el ? [el.outerHTML.length, el.textContent, el.disabled, el.className].join('|') : 'absent';
+}
+
+var initialIndicator = indicatorState();
+var quietTimer = null;
+var hardTimer = null;
+
+function finish(outcome) {
+    if (finished) return;
+    finished = true;
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    observer.disconnect();
+    ['input', 'change'].forEach(function(type) { textarea.removeEventListener(type, onEdit); });
+    done({ outcome: outcome, length: textarea.value.length, latency_ms: performance.now() - start });
+}
+
+function settle() {
+    finish(textarea.value === text ? 'stable' : 'reverted');
+}
+
+function onEdit() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(settle, quietMs);
+}
+
+var observer = new MutationObserver(function(mutations) {
+    if (dirtySelector && indicatorState() !== initialIndicator && textarea.value === text) {
+        return finish('dirty');
+    }
+    if (!textarea.isConnected) return finish('detached');
+    // Only changes to the textarea (or a re-render around it) restart the quiet period
+    var touched = mutations.some(function(m) {
+        return m.target === textarea || (m.type === 'childList' && m.target.contains(textarea));
+    });
+    if (touched) onEdit();
+});
+observer.observe(document.body, { childList: true, subtree: true, attributes: true, characterData: true });
+['input', 'change'].forEach(function(type) { textarea.addEventListener(type, onEdit); });
+
+quietTimer = setTimeout(settle, quietMs);
+hardTimer = setTimeout(function() { finish(textarea.value === text ? 'timeout' : 'reverted'); }, timeoutMs);
+"""
+
+def confirm_persistence(driver, textarea, text, quiet_period=PERSIST_QUIET_PERIOD,
+                        timeout=PERSIST_TIMEOUT, dirty_selector=DIRTY_INDICATOR_SELECTOR):
+    """
+    Wait for one in-page promise that reports whether the pasted text stuck
+
+    Args:
+        driver (WebDriver): Driver on the dashboard page
+        textarea (WebElement): Element the text was pasted into
+        text (str): Text that should remain in the textarea
+        quiet_period (float): Seconds without edits before the value counts as stable
+        timeout (float): Ceiling for the whole wait in seconds
+        dirty_selector (str): Optional save/dirty indicator selector
+
+    Returns:
+        dict: {"outcome", "length", "latency_ms"}; outcome is "stable", "dirty",
+        "reverted", "detached" or "timeout" (the text was still intact when the wait ran out)
+    """
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(
+        CONFIRM_PERSISTENCE_SCRIPT, textarea, text,
+        int(quiet_period * 1000), int(timeout * 1000), dirty_selector or None
+    )
+
+class AutomationSession:
+    """One WebDriver attached to the debugging Chrome, plus the reused dashboard tab"""
+
+    def __init__(self, debugger_address=CHROME_DEBUGGER_ADDRESS):
+        self.debugger_address = debugger_address
+        self.driver = None
+        self.dashboard_handle = None
+
+    def _driver_alive(self):
+        try:
+            self.driver.window_handles
             return True
-            
-    except Exception as e:
-        print(f"❌ Method 4 failed: {e}")
-    
-    return False
+        except Exception:
+            return False
+
+    def get_driver(self):
+        """Attach to Chrome once and re-attach only if the session died"""
+        if self.driver is None or not self._driver_alive():
+            # Chrome options to connect to existing instance
+            chrome_options = Options()
+            chrome_options.add_experimental_option("debuggerAddress", self.debugger_address)
+
+            # Connect to existing Chrome instance
+            print("🔗 Connecting to Chrome...")
+            self.driver = webdriver.Chrome(options=chrome_options)
+            self.dashboard_handle = None
+        return self.driver
+
+    def open_dashboard(self, url):
+        """Switch to the dashboard tab (opening it only the first time) and load `url`"""
+        driver = self.get_driver()
+
+        if self.dashboard_handle in driver.window_handles:
+            print("♻️ Reusing dashboard tab")
+            driver.switch_to.window(self.dashboard_handle)
+        else:
+            driver.execute_script("window.open('');")
+            driver.switch_to.window(driver.window_handles[-1])
+            self.dashboard_handle = driver.current_window_handle
 
-def automate_textarea_with_data(url, formatted_prompt):
-    """Selenium automation for textarea interaction with formatted prompt data"""
-    driver = None
-    try:
-        # Chrome options to connect to existing instance
-        chrome_options = Options()
-        chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-        
-        # Connect to existing Chrome instance
-        print("🔗 Connecting to Chrome...")
-        driver = webdriver.Chrome(options=chrome_options)
-        
-        # Open new tab and navigate
-        driver.execute_script("window.open('');")
-        driver.switch_to.window(driver.window_handles[-1])
-        
         print(f"🌐 Navigating to: {url}")
         driver.get(url)
+        return driver
+
+    def close(self):
+        """Stop chromedriver without closing the user's Chrome"""
+        if self.driver is not None:
+            try:
+                self.driver.service.stop()
+            except Exception:
+                pass
+            self.driver = None
+            self.dashboard_handle = None
+
+def automate_textarea_with_data(url, formatted_prompt, session=None):
+    """
+    Selenium automation for textarea interaction with formatted prompt data
+
+    Args:
+        url (str): Assistant dashboard URL
+        formatted_prompt (str): Prompt to paste into the system prompt textarea
+        session (AutomationSession): Reused session; a one-off session is created if omitted
+
+    Returns:
+        dict: {"persisted", "partial", "outcome", "length", "latency_ms", "attempts", "resolve_ms"}
+        where outcome is the last persistence confirmation result and partial
+        is set when only the start of the prompt could be pasted
+    """
+    outcome = {"persisted": False, "partial": False, "outcome": "not_pasted", "length": 0,
+               "latency_ms": 0.0, "attempts": 0, "resolve_ms": None}
+    try:
+        if session is None:
+            session = AutomationSession()
+        driver = session.open_dashboard(url)
         
         # Wait for page to load completely
         print("⏳ Waiting for page to load...")
@@ -201,33 +453,11 @@ def automate_textarea_with_data(url, formatted_prompt):
             lambda d: d.execute_script("return document.readyState") == "complete"
         )
         
-        # Additional wait for dynamic content
-        time.sleep(5)
-        
         # Wait for textarea to be present
         print("🔍 Looking for textarea...")
-        wait = WebDriverWait(driver, 20)
-        
-        # Multiple selectors to try
-        selectors = [
-            'textarea[data-testid="system-prompt-textarea"]',
-            'textarea[placeholder*="system"]',
-            'textarea[placeholder*="prompt"]',
-            'textarea',
-            '[data-testid="system-prompt-textarea"]',
-            '#system-prompt',
-            '.system-prompt'
-        ]
-        
-        textarea = None
-        for selector in selectors:
-            try:
-                print(f"🎯 Trying selector: {selector}")
-                textarea = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                print(f"✅ Found textarea with selector: {selector}")
-                break
-            except:
-                continue
+        resolve_start = time.perf_counter()
+        textarea = resolve_element(driver, url, TEXTAREA_SELECTORS, fallbacks=TEXTAREA_FALLBACK_SELECTORS)
+        outcome["resolve_ms"] = round((time.perf_counter() - resolve_start) * 1000, 1)
         
         if not textarea:
             print("❌ Could not find textarea with any selector!")
@@ -262,129 +492,32 @@ def automate_textarea_with_data(url, formatted_prompt):
         print(f"📝 Text to paste (first 200 chars): {formatted_prompt[:200]}...")
         print(f"📏 Total length: {len(formatted_prompt)} characters")
         
-        # PERSISTENT PASTE - keeps trying until it sticks
+        # PERSISTENT PASTE - retry until the dashboard keeps the text
         print("🔄 Starting persistent paste operation...")
         
-        for attempt in range(10):  # Try 10 times
-            print(f"🎯 Attempt {attempt + 1}/10 - Forcing paste...")
+        for attempt in range(PASTE_ATTEMPTS):
+            print(f"🎯 Attempt {attempt + 1}/{PASTE_ATTEMPTS} - Forcing paste...")
             
-            success = force_paste_text(driver, textarea, formatted_prompt)
+            method = force_paste_text(driver, textarea, formatted_prompt, target=url)
             
-            if success:
-                # Wait and check if content is still there
-                print("⏳ Waiting 2 seconds to check persistence...")
-                time.sleep(2)
+            if method:
+                # Confirm against what was actually pasted; brute force types only the start
+                pasted = formatted_prompt[:BRUTE_FORCE_CHARS] if method == "brute_force" else formatted_prompt
+                # Wait in the page until the value settles or the app marks itself dirty
+                confirmation = confirm_persistence(driver, textarea, pasted)
+                outcome.update(confirmation)
+                outcome["attempts"] = attempt + 1
+                outcome["partial"] = len(pasted) < len(formatted_prompt)
                 
-                current_value = textarea.get_attribute('value')
-                if len(current_value) > len(formatted_prompt) * 0.8:
-                    print(f"🎉 SUCCESS! Content persisted: {len(current_value)} characters!")
+                if confirmation["outcome"] in PERSISTED_OUTCOMES:
+                    print(f"🎉 SUCCESS! Content persisted ({confirmation['outcome']}): "
+                          f"{confirmation['length']} characters in {confirmation['latency_ms']:.0f} ms")
+                    outcome["persisted"] = True
                     break
                 else:
-                    print(f"⚠️ Content disappeared! Only {len(current_value)} chars remain. Retrying...")
+                    print(f"⚠️ Content not kept ({confirmation['outcome']})! Only {confirmation['length']} chars remain. Retrying...")
             else:
                 print("❌ Paste failed, retrying...")
-            
-            # Short delay before retry
-            time.sleep(1)
-        
-        # NUCLEAR OPTION - Set value and prevent any changes
-        print("💥 NUCLEAR OPTION - Locking the content in place...")
-        
-        escaped_text = json.dumps(formatted_prompt)
-        nuclear_script = f"""
-        var textarea = arguments[0];
-        var text = {escaped_text};
-        
-        // Set the value
-        textarea.value = text;
-        
-        // Override the value property to always return our text
-        Object.defineProperty(textarea, 'value', {{
-            get: function() {{ return text; }},
-            set: function(newValue) {{ 
-                console.log('Attempted to change value, blocking it');
-                return text; 
-            }},
-            configurable: false
-        }});
-        
-        // Fire events
-        ['input', 'change', 'focus', 'blur'].forEach(function(eventType) {{
-            var event = new Event(eventType, {{ bubbles: true }});
-            textarea.dispatchEvent(event);
-        }});
-        
-        // Add mutation observer to prevent external changes
-        var observer = new MutationObserver(function(mutations) {{
-            if (textarea.value !== text) {{
-                textarea.value = text;
-                console.log('Value was changed externally, restoring our text');
-            }}
-        }});
-        
-        observer.observe(textarea, {{ 
-            attributes: true, 
-            attributeFilter: ['value'] 
-        }});
-        
-        console.log('Nuclear option activated - content locked');
-        return textarea.value.length;
-        """
-        
-        try:
-            result_length = driver.execute_script(nuclear_script, textarea)
-            print(f"💥 Nuclear option executed: {result_length} characters locked!")
-            
-            # Wait to see if it holds
-            time.sleep(3)
-            final_check = textarea.get_attribute('value')
-            print(f"🔒 Final lock check: {len(final_check)} characters")
-            
-        except Exception as e:
-            print(f"❌ Nuclear option failed: {e}")
-        
-        # LAST RESORT - Continuous monitoring and re-pasting
-        print("🛡️ LAST RESORT - Starting content guardian...")
-        
-        guardian_script = f"""
-        var textarea = arguments[0];
-        var targetText = {escaped_text};
-        
-        // Function to restore content
-        function restoreContent() {{
-            if (textarea.value !== targetText) {{
-                textarea.value = targetText;
-                ['input', 'change'].forEach(function(eventType) {{
-                    var event = new Event(eventType, {{ bubbles: true }});
-                    textarea.dispatchEvent(event);
-                }});
-                console.log('Content guardian restored text');
-            }}
-        }}
-        
-        // Set initial content
-        restoreContent();
-        
-        // Monitor every 500ms
-        var guardianInterval = setInterval(restoreContent, 500);
-        
-        // Stop guardian after 30 seconds
-        setTimeout(function() {{
-            clearInterval(guardianInterval);
-            console.log('Content guardian stopped');
-        }}, 30000);
-        
-        console.log('Content guardian started - will protect for 30 seconds');
-        return 'Guardian activated';
-        """
-        
-        try:
-            result = driver.execute_script(guardian_script, textarea)
-            print(f"🛡️ Content guardian result: {result}")
-            print("🛡️ Guardian will protect content for 30 seconds!")
-            
-        except Exception as e:
-            print(f"❌ Guardian failed: {e}")
         
         print("✅ Operation completed!")
         
@@ -397,64 +530,128 @@ def automate_textarea_with_data(url, formatted_prompt):
         # Don't close the browser - let user see the result
         print("🔍 Browser left open for inspection")
 
+    return outcome
+
+def read_prompt_file(path):
+    """Read a prompt from `path`, or from stdin when `path` is "-" """
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def run_prompt_job(session, job):
+    """
+    Run one prompt job on an automation session
+
+    Shared by the automation worker and the in-process CLI path.
+
+    Args:
+        session (AutomationSession): Session holding the WebDriver and dashboard tab
+        job (dict): {"job_id", "url", "prompt", "job_title", "candidate_name"}; a
+            "prompt_file" path is still accepted in place of "prompt"
+
+    Returns:
+        dict: {"status": "success" | "error", "message", "elapsed"}
+    """
+    start = time.perf_counter()
+    url = job.get("url") or DASHBOARD_URL
+
+    if job.get("job_id"):
+        print(f"🆔 Job: {job['job_id']}")
+
+    # The prompt normally travels with the job itself
+    formatted_prompt = job.get("prompt")
+    if formatted_prompt is None and job.get("prompt_file"):
+        try:
+            formatted_prompt = read_prompt_file(job["prompt_file"])
+            print(f"📖 Loaded prompt from {job['prompt_file']}")
+        except Exception as e:
+            print(f"❌ Error reading prompt file: {e}")
+            return {"status": "error", "message": f"Error reading prompt file: {e}", "elapsed": 0.0}
+    formatted_prompt = formatted_prompt or ""
+    print(f"📏 Length: {len(formatted_prompt)} characters")
+
+    if job.get("candidate_name"):
+        print(f"👤 Candidate: {job['candidate_name']}")
+
+    if job.get("job_title"):
+        print(f"💼 Job: {job['job_title']}")
+
+    print("=" * 60)
+
+    # Run the automation
+    outcome = automate_textarea_with_data(url, formatted_prompt, session)
+    persisted = outcome["persisted"]
+    return {
+        "status": "success" if persisted else "error",
+        "message": ("Prompt pasted and persisted" + (f" (first {BRUTE_FORCE_CHARS} characters only)" if outcome["partial"] else "")
+                    if persisted else f"Prompt did not persist in the dashboard ({outcome['outcome']})"),
+        "paste": outcome,
+        # ChromeDriver window handles are CDP target ids; the browser supervisor
+        # uses this to tell the app's dashboard tab from the recruiter's own tabs
+        "dashboard_target": session.dashboard_handle,
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
+
 def main():
     """Main function to handle command line arguments and run automation"""
     parser = argparse.ArgumentParser(description='URGENT Chrome automation with LinkedIn data')
-    parser.add_argument('--linkedin-data', type=str, help='LinkedIn profile data as JSON string')
+    parser.add_argument('--linkedin-data', type=str, help='LinkedIn profile data as JSON string (only the name is used)')
+    parser.add_argument('--candidate-name', type=str, help='Candidate name shown in the logs')
     parser.add_argument('--job-title', type=str, help='Job title the candidate is applying for')
-    parser.add_argument('--prompt-file', type=str, help='Path to file containing formatted prompt')
+    parser.add_argument('--prompt-file', type=str, help='Path to file containing formatted prompt, or - for stdin')
+    parser.add_argument('--no-worker', action='store_true', help='Run in this process instead of the automation worker')
     
     args = parser.parse_args()
     
-    # Default URL
-    url = "https://dashboard.vapi.ai/v2/assistants/94e635ef-eb8f-40e0-b1b6-3958d91241da"
-    
     print("🚀 URGENT Chrome automation starting...")
     print("📋 Make sure Chrome is running with: chrome --remote-debugging-port=9222")
     print()
     
-    # Read the formatted prompt from file
-    formatted_prompt = ""
+    # Parse LinkedIn data if provided
+    candidate_name = args.candidate_name
+    if args.linkedin_data and not candidate_name:
+        try:
+            candidate_name = json.loads(args.linkedin_data).get('name', 'Unknown')
+        except:
+            print("⚠️ Warning: Could not parse LinkedIn data")
+    
+    # Read the prompt here so the job carries its own copy
+    formatted_prompt = None
     if args.prompt_file:
         try:
-            with open(args.prompt_file, 'r', encoding='utf-8') as f:
-                formatted_prompt = f.read()
+            formatted_prompt = read_prompt_file(args.prompt_file)
             print(f"📖 Loaded prompt from {args.prompt_file}")
-            print(f"📏 Length: {len(formatted_prompt)} characters")
         except Exception as e:
             print(f"❌ Error reading prompt file: {e}")
             sys.exit(1)
     
-    # Parse LinkedIn data if provided
-    if args.linkedin_data:
-        try:
-            linkedin_data = json.loads(args.linkedin_data)
-            candidate_name = linkedin_data.get('name', 'Unknown')
-            print(f"👤 Candidate: {candidate_name}")
-        except:
-            print("⚠️ Warning: Could not parse LinkedIn data")
-    
-    if args.job_title:
-        print(f"💼 Job: {args.job_title}")
-    
-    print("=" * 60)
-    
-    # Run the automation
-    automate_textarea_with_data(url, formatted_prompt)
+    job = {
+        "url": DASHBOARD_URL,
+        "prompt": formatted_prompt,
+        "job_title": args.job_title,
+        "candidate_name": candidate_name,
+    }
+    sys.exit(0 if submit_job(job, use_worker=not args.no_worker)["status"] == "success" else 1)
+
+def submit_job(job, use_worker=True):
+    """Hand a prompt job to the automation worker, or run it here when asked to"""
+    if not use_worker:
+        return run_prompt_job(AutomationSession(), job)
+
+    from automation_worker import dispatch_prompt
+    result = dispatch_prompt(job)
+    print(f"🤖 Worker result: {result.get('status')} - {result.get('message')}")
+    return result
 
 if __name__ == "__main__":
     if len(sys.argv) == 1:
         print("🧪 EMERGENCY TEST MODE...")
         
-        try:
-            with open('formatted_prompt.txt', 'r', encoding='utf-8') as f:
-                formatted_prompt = f.read()
-            print(f"📖 Found formatted_prompt.txt ({len(formatted_prompt)} chars)")
-            
-            url = "https://dashboard.vapi.ai/v2/assistants/94e635ef-eb8f-40e0-b1b6-3958d91241da"
-            automate_textarea_with_data(url, formatted_prompt)
-        except FileNotFoundError:
+        if not os.path.exists('formatted_prompt.txt'):
             print("❌ No formatted_prompt.txt found!")
             sys.exit(1)
+        print("📖 Found formatted_prompt.txt")
+        submit_job({"url": DASHBOARD_URL, "prompt": read_prompt_file('formatted_prompt.txt')})
     else:
-        main()
\ No newline at end of file
+        main()
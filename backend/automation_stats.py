@@ -0,0 +1,160 @@
+import os
+import json
+import threading
+import logging
+from urllib.parse import urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where learned selector preferences are kept between runs
+SELECTOR_CACHE_FILE = os.environ.get("SELECTOR_CACHE_FILE", os.path.join(BACKEND_DIR, "selector_cache.json"))
+PASTE_STATS_FILE = os.environ.get("PASTE_STATS_FILE", os.path.join(BACKEND_DIR, "paste_stats.json"))
+
+
+def target_key(url):
+    """Key stats by host and path so query strings don't split the history"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+class JsonStatsStore:
+    """Small JSON file of per-target statistics, rewritten atomically on save"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable stats file {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        """Write the current data (caller holds the lock)"""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Could not save stats file {self.path}: {e}")
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._data))
+
+
+class SelectorCache(JsonStatsStore):
+    """
+    Remembers which CSS selector found the element on each target page
+
+    The last winning selector is tried first next time; every selector also
+    keeps its hit count and cumulative resolve time for that target. Generic
+    fallback matches are only counted, never learned.
+    """
+
+    def order(self, url, selectors):
+        """Return `selectors` with the learned winner first, then by hit rate"""
+        with self._lock:
+            entry = self._data.get(target_key(url))
+        if not entry:
+            return list(selectors)
+
+        stats = entry.get("selectors", {})
+        preferred = entry.get("preferred")
+        ranked = sorted(
+            selectors,
+            key=lambda s: (s != preferred, -stats.get(s, {}).get("hits", 0))
+        )
+        return ranked
+
+    def record(self, url, winner, resolve_ms, fallback=False):
+        """Record one resolution; `winner` is None when nothing matched, `fallback` when it was a generic selector"""
+        key = target_key(url)
+        with self._lock:
+            entry = self._data.setdefault(key, {"preferred": None, "resolves": 0, "misses": 0, "selectors": {}})
+            entry["resolves"] += 1
+            if winner is None:
+                entry["misses"] += 1
+            elif fallback:
+                entry["fallbacks"] = entry.get("fallbacks", 0) + 1
+            else:
+                entry["preferred"] = winner
+                stats = entry["selectors"].setdefault(winner, {"hits": 0, "total_ms": 0.0})
+                stats["hits"] += 1
+                stats["total_ms"] = round(stats["total_ms"] + resolve_ms, 1)
+                stats["avg_ms"] = round(stats["total_ms"] / stats["hits"], 1)
+            for stats in entry["selectors"].values():
+                stats["hit_rate"] = round(stats["hits"] / entry["resolves"], 3)
+            self._save()
+
+
+_selector_cache = None
+_selector_cache_lock = threading.Lock()
+
+def get_selector_cache():
+    """Return the process-wide SelectorCache, loading it on first use"""
+    global _selector_cache
+    with _selector_cache_lock:
+        if _selector_cache is None:
+            _selector_cache = SelectorCache(SELECTOR_CACHE_FILE)
+        return _selector_cache
+
+
+class PasteStats(JsonStatsStore):
+    """
+    Success rate and latency of each paste method per target page
+
+    Methods that have worked are ranked by expected time per success
+    (average latency / success rate); untried methods keep their default
+    order, and methods that have only ever failed go last.
+    """
+
+    def order(self, url, methods):
+        with self._lock:
+            entry = dict(self._data.get(target_key(url), {}))
+
+        def rank(item):
+            idx, method = item
+            stats = entry.get(method)
+            if stats and stats["successes"]:
+                success_rate = stats["successes"] / stats["attempts"]
+                return (0, stats["success_ms"] / stats["successes"] / success_rate)
+            if not stats:
+                return (1, idx)
+            return (2, idx)
+
+        return [method for _, method in sorted(enumerate(methods), key=rank)]
+
+    def record(self, url, method, success, elapsed_ms):
+        key = target_key(url)
+        with self._lock:
+            stats = self._data.setdefault(key, {}).setdefault(
+                method, {"attempts": 0, "successes": 0, "success_ms": 0.0, "failure_ms": 0.0}
+            )
+            stats["attempts"] += 1
+            if success:
+                stats["successes"] += 1
+                stats["success_ms"] = round(stats["success_ms"] + elapsed_ms, 1)
+            else:
+                stats["failure_ms"] = round(stats["failure_ms"] + elapsed_ms, 1)
+            stats["success_rate"] = round(stats["successes"] / stats["attempts"], 3)
+            self._save()
+
+
+_paste_stats = None
+_paste_stats_lock = threading.Lock()
+
+def get_paste_stats():
+    """Return the process-wide PasteStats, loading it on first use"""
+    global _paste_stats
+    with _paste_stats_lock:
+        if _paste_stats is None:
+            _paste_stats = PasteStats(PASTE_STATS_FILE)
+        return _paste_stats
@@ -0,0 +1,180 @@
+"""
+Long-lived automation worker
+
+Holds one WebDriver session attached to the debugging Chrome and reuses the
+assistant dashboard tab across interviews. Prompt jobs arrive over a local
+multiprocessing connection and run one at a time in arrival order.
+
+Run directly with `python automation_worker.py`; `dispatch_prompt` also starts
+it on demand.
+"""
+import os
+import sys
+import time
+import queue
+import secrets
+import threading
+import subprocess
+import logging
+from multiprocessing.connection import Listener, Client
+
+from log_setup import console
+
+# Local IPC endpoint (override with environment variables)
+WORKER_HOST = "127.0.0.1"
+WORKER_PORT = int(os.environ.get("AUTOMATION_WORKER_PORT", "6001"))
+WORKER_START_TIMEOUT = float(os.environ.get("AUTOMATION_WORKER_START_TIMEOUT", "20"))
+WORKER_JOB_TIMEOUT = float(os.environ.get("AUTOMATION_WORKER_JOB_TIMEOUT", "300"))
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The connection unpickles whatever it receives, so the authkey is all that stops
+# another local process from running code in the worker. Without an
+# AUTOMATION_WORKER_AUTHKEY a random key is made on first use and kept in this
+# owner-only file, which the app and the worker both read.
+WORKER_KEY_FILE = os.environ.get("AUTOMATION_WORKER_KEY_FILE", os.path.join(BACKEND_DIR, ".automation_worker_key"))
+
+_spawn_lock = threading.Lock()
+_authkey = None
+_authkey_lock = threading.Lock()
+
+
+class AutomationWorkerError(Exception):
+    """Raised when the automation worker cannot be reached or does not answer"""
+
+
+def worker_authkey():
+    """Return the shared worker authkey, creating the key file on first use"""
+    global _authkey
+    with _authkey_lock:
+        if _authkey is None:
+            _authkey = os.environ.get("AUTOMATION_WORKER_AUTHKEY", "").encode() or _load_key_file()
+        return _authkey
+
+def _load_key_file(path=WORKER_KEY_FILE):
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        if os.name != "nt" and os.stat(path).st_mode & 0o077:
+            logging.warning(f"Worker key file {path} was readable by others, restricting it to the owner")
+            os.chmod(path, 0o600)
+        with open(path, 'r', encoding='utf-8') as f:
+            key = f.read().strip()
+        if not key:
+            raise AutomationWorkerError(f"Worker key file {path} is empty; delete it to make a new key")
+        return key.encode()
+
+    key = secrets.token_hex(32)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(key)
+    return key.encode()
+
+def _automation_loop(jobs):
+    """Run queued prompt jobs one by one on a single persistent session"""
+    from automate_chrome import AutomationSession, run_prompt_job
+
+    session = AutomationSession()
+    while True:
+        job, reply = jobs.get()
+        try:
+            result = run_prompt_job(session, job)
+        except Exception as e:
+            logging.exception("Automation job crashed")
+            result = {"status": "error", "message": str(e), "elapsed": 0.0}
+        reply.put(result)
+
+def _handle_client(conn, jobs):
+    """Accept one request, acknowledge it, and send the result when it is done"""
+    try:
+        job = conn.recv()
+        if job.get("type") == "ping":
+            conn.send({"status": "ok", "queued": jobs.qsize()})
+            return
+
+        reply = queue.Queue(maxsize=1)
+        jobs.put((job, reply))
+        conn.send({"status": "accepted", "queue_position": jobs.qsize()})
+
+        result = reply.get()
+        try:
+            conn.send(result)
+        except (OSError, EOFError):
+            # Client chose not to wait for the result
+            pass
+    except (OSError, EOFError) as e:
+        logging.warning(f"Automation client disconnected: {e}")
+    finally:
+        conn.close()
+
+def serve(port=WORKER_PORT):
+    """Listen for prompt jobs until the process is killed"""
+    jobs = queue.Queue()
+    threading.Thread(target=_automation_loop, args=(jobs,), daemon=True, name="automation").start()
+
+    with Listener((WORKER_HOST, port), authkey=worker_authkey()) as listener:
+        print(f"🤖 Automation worker listening on {WORKER_HOST}:{port}")
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=_handle_client, args=(conn, jobs), daemon=True).start()
+
+def _connect():
+    return Client((WORKER_HOST, WORKER_PORT), authkey=worker_authkey())
+
+def ensure_worker():
+    """Return a connection to the worker, starting the worker process if none is running"""
+    try:
+        return _connect()
+    except ConnectionRefusedError:
+        pass
+
+    with _spawn_lock:
+        # Another thread may have started it while we waited for the lock
+        try:
+            return _connect()
+        except ConnectionRefusedError:
+            pass
+
+        console("🚀 Starting automation worker...")
+        logging.info("Starting automation worker")
+        subprocess.Popen([sys.executable, os.path.join(BACKEND_DIR, "automation_worker.py")], cwd=BACKEND_DIR)
+
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                return _connect()
+            except ConnectionRefusedError:
+                time.sleep(0.2)
+
+    raise AutomationWorkerError(f"Automation worker did not start within {WORKER_START_TIMEOUT}s")
+
+def dispatch_prompt(job, wait=True, timeout=WORKER_JOB_TIMEOUT, on_ack=None):
+    """
+    Send a prompt job to the automation worker
+
+    Args:
+        job (dict): {"job_id", "url", "prompt", "job_title", "candidate_name"}
+        wait (bool): Block until the paste finishes instead of returning after the ack
+        timeout (float): Seconds to wait for the result when `wait` is set
+        on_ack (callable): Optional `on_ack(ack)` called as soon as the worker accepts the job
+
+    Returns:
+        dict: The worker's ack, or its final {"status", "message", "elapsed"} result
+    """
+    conn = ensure_worker()
+    try:
+        conn.send(job)
+        ack = conn.recv()
+        if on_ack is not None:
+            on_ack(ack)
+        if not wait:
+            return ack
+        if not conn.poll(timeout):
+            raise AutomationWorkerError(f"No automation result after {timeout}s")
+        return conn.recv()
+    except (OSError, EOFError) as e:
+        raise AutomationWorkerError(f"Lost connection to automation worker: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    serve()
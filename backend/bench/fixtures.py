@@ -0,0 +1,123 @@
+import os
+import html
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DASHBOARD_PAGE = os.path.join(FIXTURES_DIR, "dashboard.html")
+
+# Profile sizes: number of experiences and words per experience detail
+PROFILE_SIZES = {
+    "small": (3, 20),
+    "medium": (15, 80),
+    "large": (60, 250),
+    "xlarge": (200, 400),
+}
+
+# Sizes saved as HTML pages; xlarge is only used for in-process formatting
+PAGE_SIZES = ("small", "medium", "large")
+
+WORDS = (
+    "led built shipped designed scaled migrated automated customer platform data team "
+    "pipeline revenue growth api cloud service reporting analytics python react sales "
+    "launched improved reduced latency cost quality students budget partners roadmap"
+).split()
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+TITLES = ["Software Engineer", "Sales Manager", "Data Analyst", "Product Manager", "Teacher", "Designer"]
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def build_profile(size, seed=42):
+    """A deterministic profile dict of the given size, shaped like the scraper output"""
+    count, words = PROFILE_SIZES[size]
+    rng = random.Random(seed)
+    return {
+        "name": "Benchmark Candidate",
+        "bio": _sentence(rng, 25),
+        "experiences": [
+            {
+                "company": rng.choice(COMPANIES),
+                "designation": rng.choice(TITLES),
+                "duration": f"{2024 - i} - {2025 - i} · 1 yr",
+                "detail": _sentence(rng, words),
+            }
+            for i in range(count)
+        ],
+        "education": [{"degree": "BSc Computer Science", "school": "State University", "duration": "2012 - 2016"}],
+        "skills": [rng.choice(WORDS).title() for _ in range(min(count * 2, 40))],
+    }
+
+def _list_item(title, subtitle="", caption="", detail=""):
+    esc = html.escape
+    indent = "\n" + " " * 16
+    lines = [f'<span aria-hidden="true">{esc(title)}</span>']
+    if subtitle:
+        lines.append(f'<span class="hoverable-link-text"><span aria-hidden="true">{esc(subtitle)}</span></span>')
+    if caption:
+        lines.append(f'<span class="t-black--light"><span aria-hidden="true">{esc(caption)}</span></span>')
+    body = f"""
+        <li class="artdeco-list__item">
+            <div class="display-flex flex-column">
+                {indent.join(lines)}
+            </div>"""
+    if detail:
+        body += f"""
+            <div class="inline-show-more-text--is-collapsed"><span aria-hidden="true">{esc(detail)}</span>
+                <button class="inline-show-more-text__button" aria-expanded="false"
+                        onclick="this.setAttribute('aria-expanded', 'true')">see more</button></div>"""
+    return body + "\n        </li>"
+
+def _section(anchor, items):
+    return f"""
+        <section>
+            <div id="{anchor}"></div>
+            <ul>{''.join(items)}
+            </ul>
+        </section>"""
+
+def render_profile_page(profile):
+    """LinkedIn-like markup that the scraper's extraction script understands"""
+    esc = html.escape
+    experiences = [
+        _list_item(exp["designation"], exp["company"], exp["duration"], exp["detail"])
+        for exp in profile["experiences"]
+    ]
+    education = [_list_item(edu["school"], edu["degree"], edu["duration"]) for edu in profile["education"]]
+    skills = [_list_item(skill) for skill in profile["skills"]]
+
+    # Sidebar noise outside the profile sections; section scoping has to skip it
+    sidebar = [
+        _list_item(f"Suggested Person {i}", "Some Company · 3rd+", f"{1000 + i} followers")
+        for i in range(10)
+    ]
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>{esc(profile['name'])} | LinkedIn</title></head>
+<body>
+    <main>
+        <h1 class="t-24 v-align-middle">{esc(profile['name'])}</h1>
+        <div class="text-body-medium break-words">{esc(profile['bio'])}</div>{_section("experience", experiences)}{_section("education", education)}{_section("skills", skills)}
+    </main>
+    <aside>
+        <ul>{''.join(sidebar)}
+        </ul>
+    </aside>
+</body>
+</html>
+"""
+
+def profile_page_path(size, directory=FIXTURES_DIR):
+    return os.path.join(directory, f"profile_{size}.html")
+
+def write_profile_pages(directory=FIXTURES_DIR):
+    """Write one profile page per size into `directory`; returns {size: path}"""
+    paths = {}
+    for size in PAGE_SIZES:
+        path = profile_page_path(size, directory)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_profile_page(build_profile(size)))
+        paths[size] = path
+    return paths
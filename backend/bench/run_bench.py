@@ -0,0 +1,226 @@
+"""
+Offline microbenchmarks for the hot paths
+
+Times the scraper's extraction script on saved LinkedIn-like pages, profile
+decoding/encoding and prompt formatting on small to very large profiles, and
+every paste method against a stand-in dashboard page in headless Chrome.
+Results are written as JSON so two runs can be compared:
+
+    python bench/run_bench.py --output before.json
+    python bench/run_bench.py --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures
+
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+
+# Relative change that is reported as a regression/improvement when comparing
+COMPARE_THRESHOLD = 0.10
+
+
+def measure(fn, repeat, warmup=1):
+    """Run `fn` `warmup + repeat` times and summarize the timed runs in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+def bench_serialization(repeat):
+    from profile_model import Profile, dumps
+
+    results = {}
+    for size in fixtures.PROFILE_SIZES:
+        raw = dumps(fixtures.build_profile(size))
+        profile = Profile.from_json(raw)
+        results[f"decode_profile[{size}]"] = measure(lambda: Profile.from_json(raw), repeat)
+        results[f"encode_profile[{size}]"] = measure(profile.to_json, repeat)
+    return results
+
+def bench_format(repeat):
+    from app import format_linkedin_data_for_prompt, load_base_prompt
+    from profile_model import Profile
+
+    template = load_base_prompt()
+    results = {}
+    for size in fixtures.PROFILE_SIZES:
+        profile = Profile.from_dict(fixtures.build_profile(size))
+        results[f"format_prompt[{size}]"] = measure(
+            lambda: format_linkedin_data_for_prompt(profile, "Software Engineer", template), repeat
+        )
+        results[f"format_prompt_verbatim[{size}]"] = measure(
+            lambda: format_linkedin_data_for_prompt(profile, "Software Engineer", template, budget=0), repeat
+        )
+    return results
+
+def start_headless_chrome():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    return webdriver.Chrome(options=options)
+
+def file_url(path):
+    return "file://" + os.path.abspath(path).replace(os.sep, "/")
+
+def bench_extraction(driver, repeat):
+    from linkedin_scraper import EXTRACT_PROFILE_SCRIPT
+
+    # The script starts with a newline; "return" followed by a line break returns
+    # undefined (automatic semicolon insertion), so strip it first
+    extract = "return " + EXTRACT_PROFILE_SCRIPT.strip()
+
+    results = {}
+    for size in fixtures.PAGE_SIZES:
+        path = fixtures.profile_page_path(size)
+        if not os.path.exists(path):
+            fixtures.write_profile_pages()
+        driver.get(file_url(path))
+
+        expected = fixtures.build_profile(size)
+        found = json.loads(driver.execute_script(extract))
+        for key in ("experiences", "education", "skills"):
+            if len(found[key]) != len(expected[key]):
+                print(f"⚠️ extract[{size}]: expected {len(expected[key])} {key}, got {len(found[key])}")
+
+        results[f"extract_profile[{size}]"] = measure(
+            lambda: json.loads(driver.execute_script(extract)), repeat
+        )
+    return results
+
+def bench_paste(driver, repeat):
+    from selenium.webdriver.common.by import By
+    from automate_chrome import PASTE_STRATEGIES
+    from app import format_linkedin_data_for_prompt, load_base_prompt
+
+    text = format_linkedin_data_for_prompt(fixtures.build_profile("large"), "Software Engineer", load_base_prompt())
+    url = file_url(fixtures.DASHBOARD_PAGE)
+    results = {}
+
+    for name, method in PASTE_STRATEGIES.items():
+        samples = []
+        successes = 0
+        for _ in range(repeat):
+            # Fresh page per run so every method starts from an empty textarea
+            driver.get(url)
+            textarea = driver.find_element(By.CSS_SELECTOR, 'textarea[data-testid="system-prompt-textarea"]')
+            start = time.perf_counter()
+            try:
+                successes += bool(method(driver, textarea, text))
+            except Exception as e:
+                print(f"⚠️ paste[{name}] failed: {e}")
+            samples.append((time.perf_counter() - start) * 1000)
+
+        samples.sort()
+        results[f"paste[{name}]"] = {
+            "runs": repeat,
+            "success_rate": round(successes / repeat, 3),
+            "min_ms": round(samples[0], 3),
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "chars": len(text),
+        }
+    return results
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare(current, baseline_path):
+    """Print median changes against a previous results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)["results"]
+
+    print(f"\n📊 Compared with {baseline_path} (median):")
+    for name, result in sorted(current.items()):
+        old = baseline.get(name)
+        if not old:
+            print(f"  {name:<32} {result['median_ms']:>10.3f} ms  (new)")
+            continue
+        change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] if old["median_ms"] else 0.0
+        flag = "🔴" if change > COMPARE_THRESHOLD else "🟢" if change < -COMPARE_THRESHOLD else "  "
+        print(f"{flag} {name:<32} {old['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms  ({change:+.1%})")
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmarks for scraping, formatting and pasting')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per benchmark')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Where to write the JSON results')
+    parser.add_argument('--compare', help='Previous results JSON to compare against')
+    parser.add_argument('--no-browser', action='store_true', help='Only run the in-process benchmarks')
+    parser.add_argument('--regenerate-fixtures', action='store_true', help='Rewrite the saved profile pages first')
+    args = parser.parse_args()
+
+    if args.regenerate_fixtures:
+        fixtures.write_profile_pages()
+
+    results = {}
+    print("⏱️ Profile decoding and encoding...")
+    results.update(bench_serialization(args.repeat))
+    print("⏱️ Prompt formatting...")
+    results.update(bench_format(args.repeat))
+
+    if not args.no_browser:
+        driver = start_headless_chrome()
+        try:
+            print("⏱️ Profile extraction...")
+            results.update(bench_extraction(driver, args.repeat))
+            print("⏱️ Paste methods...")
+            # Paste runs reload the page each time, so use fewer of them
+            results.update(bench_paste(driver, max(1, args.repeat // 4)))
+        finally:
+            driver.quit()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in sorted(results.items()):
+        print(f"  {name:<32} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms")
+    print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Memory governance for the shared debugging Chrome
+
+The scraper and the automation worker both drive the Chrome on port 9222, and
+a day of interviews used to leave it with hundreds of tabs. The supervisor runs
+on the scraper service's event loop and, every BROWSER_SUPERVISOR_INTERVAL
+seconds:
+
+- samples memory: JS heap per tab over CDP, plus the RSS of every Chrome
+  process when psutil is installed
+- closes tabs this app opened and no longer uses (pool tabs orphaned by a
+  dropped connection, dashboard tabs of an earlier automation session) once
+  they sat idle; the recruiter's own tabs are never touched
+- restarts Chrome between jobs when it is still over CHROME_MEMORY_BUDGET_MB,
+  using CHROME_LAUNCH_COMMAND to bring it back
+"""
+import os
+import time
+import shlex
+import asyncio
+import logging
+import threading
+import subprocess
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # optional: total memory falls back to the sum of tab JS heaps
+    psutil = None
+
+from log_setup import console
+from metrics import CHROME_MEMORY, CHROME_TABS, CHROME_TABS_CLOSED, CHROME_MEMORY_RECLAIMED, CHROME_RESTARTS
+
+# How often the supervisor samples and cleans up (seconds, 0 disables it)
+SUPERVISOR_INTERVAL = float(os.environ.get("BROWSER_SUPERVISOR_INTERVAL", "60"))
+
+# Tabs the app opened but no longer uses are closed once they sat unchanged this long
+IDLE_TAB_SECONDS = float(os.environ.get("BROWSER_IDLE_TAB_SECONDS", "600"))
+
+# Restart Chrome when it still uses more than this after closing idle tabs (0 disables)
+MEMORY_BUDGET_MB = float(os.environ.get("CHROME_MEMORY_BUDGET_MB", "3072"))
+
+# Command that starts Chrome again with the same profile and debugging port;
+# without it the supervisor only closes tabs
+CHROME_LAUNCH_COMMAND = os.environ.get("CHROME_LAUNCH_COMMAND", "")
+CHROME_START_TIMEOUT = float(os.environ.get("CHROME_START_TIMEOUT", "30"))
+
+# How long a restart waits for running scrapes and pastes to finish (seconds)
+RESTART_DRAIN_TIMEOUT = float(os.environ.get("CHROME_RESTART_DRAIN_TIMEOUT", "120"))
+
+# Renderer processes exit a moment after their tab closes
+RECLAIM_SETTLE_SECONDS = 2
+
+MB = 1024 * 1024
+
+
+class BrowserSupervisor:
+    """Samples, trims and (when over budget) restarts the Chrome behind a ScraperService"""
+
+    def __init__(self, service, interval=SUPERVISOR_INTERVAL, idle_seconds=IDLE_TAB_SECONDS,
+                 budget_mb=MEMORY_BUDGET_MB, launch_command=CHROME_LAUNCH_COMMAND):
+        self.service = service
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.budget = budget_mb * MB
+        self.launch_command = launch_command
+        # Pastes in progress and whether a restart has claimed Chrome; both only
+        # change under this condition so a paste and a restart never overlap
+        self._automation = threading.Condition()
+        self._active_pastes = 0
+        self._restarting = False
+        self.last_sample = None
+        self._seen = {}
+        # Tabs this app opened (scraper pool and automation dashboard); only these are ever closed
+        self._opened = set()
+        self._dashboard = None
+        self._targets_lock = threading.Lock()
+        self._task = None
+
+    def track_opened(self, target_id):
+        """Record a tab the app opened so it can be closed once nothing uses it"""
+        with self._targets_lock:
+            self._opened.add(target_id)
+
+    def track_dashboard(self, target_id):
+        """Record the automation worker's current dashboard tab; the one before it becomes closable"""
+        if not target_id:
+            return
+        with self._targets_lock:
+            self._opened.add(target_id)
+            self._dashboard = target_id
+
+    @contextmanager
+    def automation_guard(self, timeout):
+        """
+        Keep Chrome from being restarted while the block drives it
+
+        Waits out a restart that is already under way; once the block is
+        entered, a restart waits until it has left.
+
+        Raises:
+            RuntimeError: if Chrome is still restarting after `timeout` seconds
+        """
+        with self._automation:
+            if not self._automation.wait_for(lambda: not self._restarting, timeout):
+                raise RuntimeError("Chrome is still restarting, try again shortly")
+            self._active_pastes += 1
+        try:
+            yield
+        finally:
+            with self._automation:
+                self._active_pastes -= 1
+                self._automation.notify_all()
+
+    def _pastes_running(self):
+        with self._automation:
+            return self._active_pastes > 0
+
+    def _end_restart(self):
+        with self._automation:
+            self._restarting = False
+            self._automation.notify_all()
+
+    def start(self):
+        """Start the periodic check on the service loop (safe to call from any thread)"""
+        if self.interval > 0:
+            self.service.loop.call_soon_threadsafe(self._start)
+
+    def _start(self):
+        if self._task is None:
+            self._task = self.service.loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Browser supervisor check failed: {e}")
+
+    async def check(self):
+        """One supervision round: sample, close idle tabs, restart if still over budget"""
+        sample = await self.sample()
+        if await self.close_idle_tabs(sample):
+            await asyncio.sleep(RECLAIM_SETTLE_SECONDS)
+            after = await self.sample()
+            self._reclaimed("close_tabs", sample, after)
+            sample = after
+
+        if self.budget > 0 and sample["total_bytes"] > self.budget:
+            await self.restart(sample)
+
+    async def sample(self):
+        """Memory per tab (JS heap) and for the whole browser"""
+        browser = await self.service._get_browser()
+        targets = (await browser.send("Target.getTargets"))["targetInfos"]
+        tabs = []
+        for target in targets:
+            if target["type"] != "page":
+                continue
+            tabs.append({
+                "target_id": target["targetId"],
+                "url": target["url"],
+                "js_heap_bytes": await self._heap_usage(browser, target["targetId"]),
+            })
+
+        js_heap = sum(tab["js_heap_bytes"] or 0 for tab in tabs)
+        rss = await self._process_rss(browser)
+        sample = {
+            "time": time.time(),
+            "tab_count": len(tabs),
+            "js_heap_bytes": js_heap,
+            "rss_bytes": rss,
+            "total_bytes": rss if rss is not None else js_heap,
+            "source": "rss" if rss is not None else "js_heap",
+            "tabs": tabs,
+        }
+
+        CHROME_TABS.set(len(tabs))
+        CHROME_MEMORY.set(js_heap, scope="js_heap")
+        CHROME_MEMORY.set(sample["total_bytes"], scope="total")
+        self.last_sample = dict(
+            sample, tabs=sorted(tabs, key=lambda tab: tab["js_heap_bytes"] or 0, reverse=True)[:20]
+        )
+        return sample
+
+    async def _heap_usage(self, browser, target_id):
+        # Attach just for the reading so tabs opened by other clients are covered too
+        try:
+            session = await browser.attach(target_id)
+        except Exception:
+            return None
+        try:
+            usage = await session.send("Runtime.getHeapUsage", _timeout=5)
+            return int(usage["usedSize"])
+        except Exception:
+            return None
+        finally:
+            try:
+                await browser.detach(session)
+            except Exception:
+                pass
+
+    async def _process_rss(self, browser):
+        if psutil is None:
+            return None
+        try:
+            info = await browser.send("SystemInfo.getProcessInfo")
+        except Exception as e:
+            logging.debug(f"SystemInfo.getProcessInfo unavailable: {e}")
+            return None
+        total = 0
+        for process in info.get("processInfo", []):
+            try:
+                total += psutil.Process(process["id"]).memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    async def close_idle_tabs(self, sample):
+        """Close app-opened tabs that are out of use and haven't changed URL for `idle_seconds`; returns how many"""
+        now = time.monotonic()
+        live = {tab["target_id"] for tab in sample["tabs"]}
+        with self._targets_lock:
+            # Forget tabs that were open at the last sample and have been closed since
+            self._opened -= set(self._seen) - live
+            closable = self._opened - self.service.pool_target_ids() - {self._dashboard}
+
+        current = {}
+        idle = []
+        for tab in sample["tabs"]:
+            url, since = self._seen.get(tab["target_id"], (None, now))
+            if url != tab["url"]:
+                since = now
+            current[tab["target_id"]] = (tab["url"], since)
+            if tab["target_id"] in closable and now - since >= self.idle_seconds:
+                idle.append(tab)
+        self._seen = current
+
+        # Closing the last page would take the whole window (or Chrome) with it
+        if idle and len(idle) >= len(sample["tabs"]):
+            idle = idle[:-1]
+
+        browser = await self.service._get_browser()
+        closed = 0
+        for tab in idle:
+            try:
+                await browser.send("Target.closeTarget", targetId=tab["target_id"], _timeout=5)
+            except Exception as e:
+                logging.debug(f"Could not close idle tab {tab['url']}: {e}")
+                continue
+            self._seen.pop(tab["target_id"], None)
+            with self._targets_lock:
+                self._opened.discard(tab["target_id"])
+            closed += 1
+        if closed:
+            CHROME_TABS_CLOSED.inc(closed, reason="idle")
+            logging.info(f"BROWSER: closed {closed} idle tabs")
+        return closed
+
+    async def restart(self, sample):
+        """Restart Chrome once no scrape or paste is using it"""
+        if not self.launch_command:
+            CHROME_RESTARTS.inc(result="skipped")
+            logging.warning(
+                f"BROWSER: {sample['total_bytes'] / MB:.0f} MB is over the {self.budget / MB:.0f} MB budget, "
+                f"but CHROME_LAUNCH_COMMAND is not set so Chrome is left running"
+            )
+            return
+
+        scheduler = self.service.scheduler
+        scheduler.pause()
+        # From here on no new paste starts; the ones already running are waited for
+        with self._automation:
+            self._restarting = True
+        try:
+            deadline = time.monotonic() + RESTART_DRAIN_TIMEOUT
+            while scheduler.busy or self._pastes_running():
+                if time.monotonic() > deadline:
+                    CHROME_RESTARTS.inc(result="deferred")
+                    logging.warning("BROWSER: restart deferred, Chrome stayed busy")
+                    return
+                await asyncio.sleep(0.5)
+
+            console(f"♻️ Chrome uses {sample['total_bytes'] / MB:.0f} MB (budget {self.budget / MB:.0f} MB), restarting it")
+            logging.info(f"BROWSER: restarting at {sample['total_bytes'] / MB:.0f} MB")
+            await self.service._drop_browser()
+            subprocess.Popen(
+                shlex.split(self.launch_command, posix=os.name != "nt"),
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+            )
+            await self._wait_for_browser()
+            await self.service._warm_up()
+
+            self._seen = {}
+            with self._targets_lock:
+                self._opened = set(self.service.pool_target_ids())
+                self._dashboard = None
+            self._reclaimed("restart", sample, await self.sample())
+            CHROME_RESTARTS.inc(result="ok")
+        except Exception:
+            CHROME_RESTARTS.inc(result="failed")
+            logging.exception("BROWSER: restart failed")
+        finally:
+            scheduler.resume()
+            self._end_restart()
+
+    async def _wait_for_browser(self):
+        deadline = time.monotonic() + CHROME_START_TIMEOUT
+        while True:
+            try:
+                return await self.service._get_browser()
+            except Exception:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Chrome did not come back within {CHROME_START_TIMEOUT}s")
+                await asyncio.sleep(0.5)
+
+    def _reclaimed(self, action, before, after):
+        freed = max(0, before["total_bytes"] - after["total_bytes"])
+        CHROME_MEMORY_RECLAIMED.inc(freed, action=action)
+        logging.info(f"BROWSER: {action} reclaimed {freed / MB:.1f} MB")
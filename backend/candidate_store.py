@@ -0,0 +1,273 @@
+"""
+Searchable store of every candidate set up for an interview
+
+Each /submit writes the scraped profile and the job title into SQLite, so
+"everyone who worked at X" is a query instead of a re-scrape. Lookups by
+canonical URL, name prefix and company prefix use plain indexes; free text
+over bio, experience, education and skills goes through an FTS5 index (with
+a slow LIKE fallback on SQLite builds that lack FTS5).
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+import logging
+
+from profile_cache import canonicalize_linkedin_url
+
+# Store settings (override with environment variables)
+CANDIDATE_DB_PATH = os.environ.get("CANDIDATE_DB", "candidates.db")
+SEARCH_PAGE_SIZE = int(os.environ.get("CANDIDATE_SEARCH_PAGE_SIZE", "20"))
+SEARCH_MAX_PAGE_SIZE = 100
+
+# Words in a free-text query; everything else (FTS5 operators, quotes) is dropped
+QUERY_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    bio TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_name ON candidates (name);
+CREATE INDEX IF NOT EXISTS candidates_last_seen ON candidates (last_seen);
+
+CREATE TABLE IF NOT EXISTS candidate_experiences (
+    candidate_id INTEGER NOT NULL REFERENCES candidates (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    company TEXT NOT NULL COLLATE NOCASE,
+    designation TEXT NOT NULL COLLATE NOCASE,
+    duration TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidate_experiences_company ON candidate_experiences (company, candidate_id);
+CREATE INDEX IF NOT EXISTS candidate_experiences_candidate ON candidate_experiences (candidate_id);
+
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY,
+    candidate_id INTEGER NOT NULL REFERENCES candidates (id) ON DELETE CASCADE,
+    job_title TEXT NOT NULL COLLATE NOCASE,
+    job_id TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS interviews_candidate ON interviews (candidate_id, created_at);
+CREATE INDEX IF NOT EXISTS interviews_job_title ON interviews (job_title, candidate_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5 (
+    name, bio, experience, education, skills, tokenize = 'unicode61'
+)
+"""
+
+
+def _like_prefix(text):
+    """LIKE pattern matching values that start with `text` (wildcards in it are literal)"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def _fts_query(text):
+    """
+    Turn user input into a safe FTS5 query: every word must match, the last one as a prefix
+
+    Returns None when the input has no words.
+    """
+    tokens = QUERY_TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class CandidateStore:
+    """
+    SQLite-backed candidates, their experience entries and interview history
+
+    One connection is shared behind a lock, like the profile cache; writes
+    are a handful of rows per interview and searches touch one page.
+    """
+
+    def __init__(self, db_path=CANDIDATE_DB_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        try:
+            self._db.execute(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError as e:
+            logging.warning(f"CANDIDATES: SQLite has no FTS5 ({e}), text search falls back to LIKE")
+            self.full_text = False
+        self._db.commit()
+
+    def record(self, profile, url, job_title, job_id=None):
+        """
+        Insert or refresh a candidate and log one interview for `job_title`
+
+        Args:
+            profile (Profile): Scraped profile
+            url (str): Profile URL as submitted (stored canonicalized)
+            job_title (str): Job title the candidate is interviewed for
+            job_id (str): Optional id of the interview setup job
+
+        Returns:
+            int: The candidate id
+        """
+        url = canonicalize_linkedin_url(url)
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute("SELECT id FROM candidates WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                candidate_id = self._db.execute(
+                    "INSERT INTO candidates (url, name, bio, data, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, profile.name, profile.bio, profile.to_json(), now, now)
+                ).lastrowid
+            else:
+                candidate_id = row[0]
+                self._db.execute(
+                    "UPDATE candidates SET name = ?, bio = ?, data = ?, last_seen = ? WHERE id = ?",
+                    (profile.name, profile.bio, profile.to_json(), now, candidate_id)
+                )
+                self._db.execute("DELETE FROM candidate_experiences WHERE candidate_id = ?", (candidate_id,))
+
+            self._db.executemany(
+                "INSERT INTO candidate_experiences (candidate_id, position, company, designation, duration) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(candidate_id, idx, exp.company, exp.designation, exp.duration)
+                 for idx, exp in enumerate(profile.experiences)]
+            )
+            self._db.execute(
+                "INSERT INTO interviews (candidate_id, job_title, job_id, created_at) VALUES (?, ?, ?, ?)",
+                (candidate_id, job_title or "", job_id, now)
+            )
+            if self.full_text:
+                self._db.execute("DELETE FROM candidates_fts WHERE rowid = ?", (candidate_id,))
+                self._db.execute(
+                    "INSERT INTO candidates_fts (rowid, name, bio, experience, education, skills) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        candidate_id, profile.name, profile.bio,
+                        "\n".join(f"{exp.designation} {exp.company} {exp.detail}" for exp in profile.experiences),
+                        "\n".join(f"{edu.degree} {edu.school}" for edu in profile.education),
+                        ", ".join(profile.skills),
+                    )
+                )
+        return candidate_id
+
+    def search(self, text="", company="", name="", job_title="", page=1, per_page=SEARCH_PAGE_SIZE):
+        """
+        Find candidates; all given filters must match
+
+        Args:
+            text (str): Free text over name, bio, experience, education and skills
+            company (str): Company name prefix (any experience entry)
+            name (str): Candidate name prefix
+            job_title (str): Job title prefix of any of their interviews
+            page (int): 1-based page number
+            per_page (int): Results per page (at most SEARCH_MAX_PAGE_SIZE)
+
+        Returns:
+            dict: {"results", "total", "page", "per_page", "pages"}; results are
+            ranked by text relevance when `text` is given, else most recent first
+        """
+        page = max(1, page)
+        per_page = max(1, min(per_page, SEARCH_MAX_PAGE_SIZE))
+
+        joins, where, params = [], [], []
+        fts = _fts_query(text) if self.full_text else None
+        if fts:
+            joins.append("JOIN candidates_fts ON candidates_fts.rowid = c.id")
+            where.append("candidates_fts MATCH ?")
+            params.append(fts)
+        elif text.strip():
+            where.append("c.data LIKE ? ESCAPE '\\'")
+            params.append("%" + _like_prefix(text.strip()))
+        if company:
+            where.append(
+                "c.id IN (SELECT candidate_id FROM candidate_experiences WHERE company LIKE ? ESCAPE '\\')"
+            )
+            params.append(_like_prefix(company))
+        if name:
+            where.append("c.name LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(name))
+        if job_title:
+            where.append("c.id IN (SELECT candidate_id FROM interviews WHERE job_title LIKE ? ESCAPE '\\')")
+            params.append(_like_prefix(job_title))
+
+        base = "FROM candidates c " + " ".join(joins)
+        if where:
+            base += " WHERE " + " AND ".join(where)
+        if fts:
+            columns = "c.id, c.url, c.name, c.bio, c.last_seen, snippet(candidates_fts, -1, '[', ']', '…', 12)"
+            order = "bm25(candidates_fts), c.last_seen DESC"
+        else:
+            columns = "c.id, c.url, c.name, c.bio, c.last_seen, NULL"
+            order = "c.last_seen DESC"
+
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT {columns} {base} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [per_page, (page - 1) * per_page]
+            ).fetchall()
+            details = self._page_details([row[0] for row in rows])
+
+        results = []
+        for candidate_id, url, cand_name, bio, last_seen, match in rows:
+            companies, interviews = details.get(candidate_id, ([], []))
+            result = {
+                "id": candidate_id,
+                "url": url,
+                "name": cand_name,
+                "bio": bio,
+                "companies": companies,
+                "interviews": interviews,
+                "last_seen": last_seen,
+            }
+            if match is not None:
+                result["match"] = match
+            results.append(result)
+
+        return {
+            "results": results,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": (total + per_page - 1) // per_page,
+        }
+
+    def _page_details(self, ids):
+        """Companies and interviews for one page of candidates (caller holds the lock)"""
+        details = {candidate_id: ([], []) for candidate_id in ids}
+        if not ids:
+            return details
+        marks = ",".join("?" * len(ids))
+        for candidate_id, company in self._db.execute(
+            f"SELECT candidate_id, company FROM candidate_experiences WHERE candidate_id IN ({marks}) "
+            f"ORDER BY candidate_id, position", ids
+        ):
+            companies = details[candidate_id][0]
+            if company and company not in companies:
+                companies.append(company)
+        for candidate_id, job_title, job_id, created_at in self._db.execute(
+            f"SELECT candidate_id, job_title, job_id, created_at FROM interviews WHERE candidate_id IN ({marks}) "
+            f"ORDER BY candidate_id, created_at DESC", ids
+        ):
+            details[candidate_id][1].append({"job_title": job_title, "job_id": job_id, "created_at": created_at})
+        return details
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_candidate_store():
+    """Return the process-wide CandidateStore, creating it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CandidateStore()
+        return _store
@@ -0,0 +1,201 @@
+import os
+import json
+import asyncio
+import itertools
+import logging
+import urllib.request
+
+import websockets
+
+# Default per-call timeout for CDP commands (seconds)
+CDP_CALL_TIMEOUT = float(os.environ.get("CDP_CALL_TIMEOUT", "30"))
+
+
+class CDPError(Exception):
+    """A CDP command failed or the connection went away"""
+
+
+class CDPTimeout(CDPError):
+    """A CDP command or event wait did not finish in time"""
+
+
+def _http_json(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class CDPConnection:
+    """
+    One WebSocket to the browser endpoint, shared by every attached tab
+
+    Commands are matched to responses by id, so any number of tabs can have
+    calls in flight at once on a single event loop. Events are routed to
+    listeners by (sessionId, method).
+    """
+
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self._ws = None
+        self._reader = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self.closed = True
+
+    async def connect(self):
+        self._ws = await websockets.connect(self.ws_url, max_size=None, ping_interval=None)
+        self.closed = False
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def send(self, method, params=None, session_id=None, timeout=CDP_CALL_TIMEOUT):
+        """Send a command and wait for its result; cancelling the caller abandons the call"""
+        if self.closed:
+            raise CDPError(f"Connection closed, cannot send {method}")
+
+        call_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+
+        message = {"id": call_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CDPTimeout(f"{method} timed out after {timeout}s")
+        except websockets.ConnectionClosed as e:
+            raise CDPError(f"Connection closed during {method}: {e}")
+        finally:
+            self._pending.pop(call_id, None)
+
+    async def _read_loop(self):
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.get(message["id"])
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CDPError(message["error"].get("message", str(message["error"]))))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    self._dispatch(message.get("sessionId"), message.get("method"), message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("Connection closed"))
+
+    def _dispatch(self, session_id, method, params):
+        for callback in list(self._listeners.get((session_id, method), ())):
+            try:
+                callback(params)
+            except Exception:
+                logging.exception(f"CDP listener for {method} failed")
+
+    def add_listener(self, session_id, method, callback):
+        self._listeners.setdefault((session_id, method), []).append(callback)
+
+    def remove_listener(self, session_id, method, callback):
+        callbacks = self._listeners.get((session_id, method), [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._listeners.pop((session_id, method), None)
+
+    def remove_session(self, session_id):
+        for key in [key for key in self._listeners if key[0] == session_id]:
+            del self._listeners[key]
+
+    async def close(self):
+        self.closed = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class CDPSession:
+    """A tab attached to the shared connection with a flattened session id"""
+
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    @property
+    def id(self):
+        return self.target_id
+
+    async def send(self, method, _timeout=CDP_CALL_TIMEOUT, **params):
+        return await self.connection.send(method, params, session_id=self.session_id, timeout=_timeout)
+
+    def on(self, method, callback):
+        self.connection.add_listener(self.session_id, method, callback)
+
+    def off(self, method, callback):
+        self.connection.remove_listener(self.session_id, method, callback)
+
+    async def wait_for(self, method, predicate=None, timeout=CDP_CALL_TIMEOUT):
+        """Wait for the next `method` event (matching `predicate`) and return its params"""
+        future = asyncio.get_running_loop().create_future()
+
+        def callback(params):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        self.on(method, callback)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CDPTimeout(f"No {method} event within {timeout}s")
+        finally:
+            self.off(method, callback)
+
+
+class CDPBrowser:
+    """Browser-level CDP client: opens and closes tabs over one connection"""
+
+    def __init__(self, debug_url):
+        self.debug_url = debug_url.rstrip("/")
+        self.connection = None
+
+    @property
+    def connected(self):
+        return self.connection is not None and not self.connection.closed
+
+    async def connect(self):
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(None, _http_json, f"{self.debug_url}/json/version")
+        self.connection = CDPConnection(version["webSocketDebuggerUrl"])
+        await self.connection.connect()
+
+    async def send(self, method, _timeout=CDP_CALL_TIMEOUT, **params):
+        return await self.connection.send(method, params, timeout=_timeout)
+
+    async def new_tab(self, url="about:blank"):
+        target = await self.send("Target.createTarget", url=url)
+        attached = await self.send("Target.attachToTarget", targetId=target["targetId"], flatten=True)
+        return CDPSession(self.connection, target["targetId"], attached["sessionId"])
+
+    async def close_tab(self, session):
+        self.connection.remove_session(session.session_id)
+        await self.send("Target.closeTarget", targetId=session.target_id, _timeout=5)
+
+    async def attach(self, target_id):
+        """Attach to an existing target (e.g. a tab another client opened)"""
+        attached = await self.send("Target.attachToTarget", targetId=target_id, flatten=True)
+        return CDPSession(self.connection, target_id, attached["sessionId"])
+
+    async def detach(self, session):
+        self.connection.remove_session(session.session_id)
+        await self.send("Target.detachFromTarget", sessionId=session.session_id, _timeout=5)
+
+    async def close(self):
+        if self.connection is not None:
+            await self.connection.close()
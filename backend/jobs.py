@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from metrics import JOBS_IN_FLIGHT, JOBS_FINISHED
+from log_setup import job_context
+
+# Worker pool sizing (override with environment variables)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+MAX_PENDING_JOBS = int(os.environ.get("MAX_PENDING_JOBS", "50"))
+JOB_RETENTION_SECONDS = int(os.environ.get("JOB_RETENTION_SECONDS", "3600"))
+
+# Events that end a job's progress stream
+TERMINAL_EVENTS = ("done", "error")
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are waiting for a worker"""
+
+
+class Job:
+    """A single interview setup job and its progress"""
+
+    def __init__(self, job_id, name):
+        self.id = job_id
+        self.name = name
+        self.status = "queued"
+        self.stage = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.timings = {}
+        self.result = None
+        self.error = None
+        self.events = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def emit(self, event, **data):
+        """
+        Append a progress event and wake up anyone streaming this job
+
+        Every event carries a sequence number (used as the SSE id) and the time
+        elapsed since the job was submitted.
+        """
+        with self._changed:
+            self.events.append({
+                "seq": len(self.events) + 1,
+                "event": event,
+                "stage": self.stage,
+                "elapsed": round(time.time() - self.created_at, 3),
+                "data": data,
+            })
+            self._changed.notify_all()
+
+    def events_since(self, seq, timeout=None):
+        """
+        Return the events after sequence number `seq`
+
+        Blocks up to `timeout` seconds while there is nothing new and the job
+        has not finished; returns an empty list on timeout.
+        """
+        with self._changed:
+            if len(self.events) <= seq and not self.finished:
+                self._changed.wait(timeout)
+            return self.events[seq:]
+
+    @property
+    def finished(self):
+        return bool(self.events) and self.events[-1]["event"] in TERMINAL_EVENTS
+
+    @contextmanager
+    def track(self, stage):
+        """Mark the job as being in `stage` and record how long the stage takes"""
+        with self._lock:
+            self.stage = stage
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[stage] = round(elapsed, 3)
+
+    def to_dict(self):
+        with self._lock:
+            now = self.finished_at or time.time()
+            return {
+                "job_id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "stage": self.stage,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "queue_wait": round((self.started_at or now) - self.created_at, 3),
+                "elapsed": round(now - self.created_at, 3),
+                "timings": dict(self.timings),
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class JobManager:
+    """Runs jobs on a bounded background thread pool and keeps their status for polling"""
+
+    def __init__(self, max_workers=JOB_WORKERS, max_pending=MAX_PENDING_JOBS,
+                 retention=JOB_RETENTION_SECONDS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._max_pending = max_pending
+        self._retention = retention
+        self._jobs = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, name, fn, *args, **kwargs):
+        """
+        Enqueue `fn(job, *args, **kwargs)` and return the Job immediately
+
+        Raises:
+            JobQueueFull: if `max_pending` jobs are already waiting
+        """
+        with self._lock:
+            self._prune()
+            if self._pending >= self._max_pending:
+                raise JobQueueFull(f"{self._pending} jobs already waiting, try again later")
+            job = Job(uuid.uuid4().hex, name)
+            self._jobs[job.id] = job
+            self._pending += 1
+        JOBS_IN_FLIGHT.inc(state="queued")
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn, args, kwargs):
+        with self._lock:
+            self._pending -= 1
+        JOBS_IN_FLIGHT.dec(state="queued")
+        JOBS_IN_FLIGHT.inc(state="running")
+        job.started_at = time.time()
+        job.status = "running"
+        job.emit("started")
+        # Everything logged while the job runs carries its id and stage
+        with job_context(job):
+            try:
+                job.result = fn(job, *args, **kwargs)
+                job.status = "success"
+            except Exception as e:
+                logging.exception(f"Job {job.id} failed in stage {job.stage}")
+                job.error = str(e)
+                job.status = "error"
+            finally:
+                JOBS_IN_FLIGHT.dec(state="running")
+                JOBS_FINISHED.inc(status=job.status)
+                job.finished_at = time.time()
+                job.stage = "done" if job.status == "success" else job.stage
+                logging.info(f"JOB {job.status.upper()}: {job.id}", extra={
+                    "timings": dict(job.timings),
+                    "queue_wait": round(job.started_at - job.created_at, 3),
+                    "elapsed": round(job.finished_at - job.created_at, 3),
+                })
+                if job.status == "success":
+                    job.emit("done", result=job.result)
+                else:
+                    job.emit("error", message=job.error)
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window (caller holds the lock)"""
+        cutoff = time.time() - self._retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
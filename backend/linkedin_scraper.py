@@ -1,58 +1,805 @@
-import pychrome
+import os
 import time
 import json
+import atexit
+import asyncio
+import threading
+import logging
+import concurrent.futures
+from contextlib import asynccontextmanager
 
-def scrape_linkedin_profile(linkedin_url):
-    # Set up the connection to the Chrome browser (assuming it's running on port 9222)
-    browser = pychrome.Browser(url="http://127.0.0.1:9222")
-    tab = browser.new_tab()
-    tab.start()
+from cdp_async import CDPBrowser, CDP_CALL_TIMEOUT
+from scrape_scheduler import PriorityScheduler, DomainRateLimiter
+from resource_blocking import TabBlocker, WeightBaseline
+from browser_supervisor import BrowserSupervisor
+from profile_model import Profile, cdp_json, decode_section
+from metrics import (
+    time_stage, observe_stage, SCRAPE_FAILURES, SCRAPE_RETRIES, SCRAPE_REQUESTS, SCRAPES_IN_FLIGHT
+)
 
-    tab.call_method("Page.enable")
-    tab.call_method("Runtime.enable")
+# Chrome started with --remote-debugging-port=9222
+CHROME_DEBUG_URL = os.environ.get("CHROME_DEBUG_URL", "http://127.0.0.1:9222")
 
-    tab.call_method("Page.navigate", url=linkedin_url)
-    time.sleep(10)  # Wait for the page to load dynamic content
+# Tab pool sizing (override with environment variables)
+TAB_POOL_SIZE = int(os.environ.get("SCRAPER_TAB_POOL_SIZE", "2"))
+TAB_MAX_NAVIGATIONS = int(os.environ.get("SCRAPER_TAB_MAX_NAVIGATIONS", "20"))
+TAB_LEASE_TIMEOUT = float(os.environ.get("SCRAPER_TAB_LEASE_TIMEOUT", "60"))
 
-    # JavaScript to scrape the profile data
-    script = """
-    (() => {
-        const nameEl = document.querySelector('h1.t-24.v-align-middle');
-        const bioEl = document.querySelector('[class*="text-body-medium"][class*="break-words"]');
-        const experiences = [];
+# Upper bound on how long we wait for a profile to render (seconds)
+READY_TIMEOUT = float(os.environ.get("SCRAPE_READY_TIMEOUT", "15"))
 
-        const name = nameEl ? nameEl.innerText.trim() : "Name not found";
-        const bio = bioEl ? bioEl.innerText.trim() : "Bio not found";
+# Extra attempts (each on a fresh tab) when a scrape raises
+SCRAPE_RETRIES_MAX = int(os.environ.get("SCRAPE_RETRIES", "1"))
 
-        const expItems = document.querySelectorAll('.artdeco-list__item');
+# Ceiling for one whole scrape through the sync wrapper (seconds)
+SCRAPE_TIMEOUT = float(os.environ.get("SCRAPE_TIMEOUT", "90"))
 
-        expItems.forEach(item => {
-            const company = item.querySelector('.hoverable-link-text span[aria-hidden="true"]')?.innerText.trim() || '';
-            const designation = item.querySelector('.display-flex.flex-column span[aria-hidden="true"]')?.innerText.trim() || '';
-            const duration = item.querySelector('.t-black--light span[aria-hidden="true"]')?.innerText.trim() || '';
-            const detail = item.querySelector('.inline-show-more-text--is-collapsed span[aria-hidden="true"]')?.innerText.trim() || '';
+# Lifecycle events that mean the document is parsed and worth polling
+READY_LIFECYCLE_EVENTS = ("DOMContentLoaded", "load")
 
-            const irrelevantDurations = ['followers', 'members', 'Published'];
-            if (company.includes("3rd+") || duration.includes("3rd+") || irrelevantDurations.some(keyword => duration.includes(keyword))) {
-                return;
-            }
+# "Show all" subpages worth following when the profile page truncates a section
+# (comma separated: experience, education, skills; empty disables)
+FOLLOW_DETAILS = tuple(
+    kind.strip() for kind in os.environ.get("SCRAPE_FOLLOW_DETAILS", "experience,skills").split(",") if kind.strip()
+)
+
+# Profile section anchor id -> key in the scraped profile dict
+SECTION_KEYS = {"experience": "experiences", "education": "education", "skills": "skills"}
+
+# Resolves true once `isReady` holds, or with its last value when the
+# remaining time (%d ms, filled in per call) runs out
+_WAIT_UNTIL_TEMPLATE = """
+new Promise(resolve => {
+    const isReady = () => { %s };
+    if (isReady()) return resolve(true);
+    const observer = new MutationObserver(() => {
+        if (isReady()) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(true);
+        }
+    });
+    observer.observe(document.documentElement, { childList: true, subtree: true });
+    const timer = setTimeout(() => { observer.disconnect(); resolve(isReady()); }, %%d);
+})
+"""
+
+# Profile page: the name heading and the experience list are rendered
+READY_SCRIPT = _WAIT_UNTIL_TEMPLATE % """
+        if (!document.querySelector('h1.t-24.v-align-middle')) return false;
+        if (document.querySelector('#experience')?.closest('section')?.querySelector('li.artdeco-list__item')) return true;
+        // Profiles without an experience section never render the list
+        return document.readyState === 'complete' && !document.querySelector('#experience');
+"""
+
+# "Show all" details page: the list has been rendered
+DETAILS_READY_SCRIPT = _WAIT_UNTIL_TEMPLATE % """
+        return !!document.querySelector('main section li.artdeco-list__item');
+"""
+
+# Name and headline only, read as soon as the document is parsed so progress
+# listeners get them before the experience list has rendered
+PROFILE_BASICS_SCRIPT = """
+(() => {
+    const nameEl = document.querySelector('h1.t-24.v-align-middle');
+    const bioEl = document.querySelector('[class*="text-body-medium"][class*="break-words"]');
+    return JSON.stringify({
+        name: nameEl ? nameEl.innerText.trim() : null,
+        bio: bioEl ? bioEl.innerText.trim() : null
+    });
+})()
+"""
+
+# Shared in-page helpers: expand collapsed "see more" text and read list items.
+# Each item is read in one pass over its visible spans instead of one
+# querySelector per field.
+_SECTION_HELPERS = """
+    const expandAll = async (roots) => {
+        const buttons = [];
+        roots.forEach(root => buttons.push(...root.querySelectorAll('.inline-show-more-text__button[aria-expanded="false"]')));
+        if (!buttons.length) return;
+        buttons.forEach(button => button.click());
+        // One short settle for all of them rather than one per button
+        await new Promise(resolve => setTimeout(resolve, 50));
+    };
 
-            if (company && designation && duration) {
-                experiences.push({
-                    company,
-                    designation,
-                    duration,
-                    detail
-                });
+    const readItem = (item) => {
+        const fields = { title: '', subtitle: '', caption: '', detail: '' };
+        item.querySelectorAll('span[aria-hidden="true"]').forEach(span => {
+            // Nested positions belong to their own list item
+            if (span.closest('li') !== item) return;
+            const holder = span.closest('[class*="inline-show-more-text"], .t-black--light, .hoverable-link-text, li');
+            const field = holder === item ? 'title'
+                : holder.matches('.hoverable-link-text') ? 'subtitle'
+                : holder.matches('.t-black--light') ? 'caption'
+                : 'detail';
+            if (!fields[field]) fields[field] = span.innerText.trim();
+        });
+        return fields;
+    };
+
+    const topLevelItems = (root) => Array.from(root.querySelectorAll('li.artdeco-list__item'))
+        .filter(item => !item.parentElement.closest('li.artdeco-list__item'));
+
+    const readSection = (kind, root) => {
+        const entries = [];
+        topLevelItems(root).forEach(item => {
+            const f = readItem(item);
+            if (kind === 'experience') {
+                if (f.subtitle && f.title && f.caption) {
+                    entries.push({ company: f.subtitle, designation: f.title, duration: f.caption, detail: f.detail });
+                }
+            } else if (kind === 'education') {
+                if (f.title) entries.push({ school: f.title, degree: f.subtitle, duration: f.caption });
+            } else if (f.title) {
+                entries.push(f.title);
             }
         });
+        return entries;
+    };
+"""
+
+# JavaScript to scrape the profile page, scoped to the experience, education
+# and skills sections; resolves to a JSON string. `more` lists the "show all"
+# links of sections the page truncated.
+EXTRACT_PROFILE_SCRIPT = """
+(async () => {
+""" + _SECTION_HELPERS + """
+    const nameEl = document.querySelector('h1.t-24.v-align-middle');
+    const bioEl = document.querySelector('[class*="text-body-medium"][class*="break-words"]');
+    const name = nameEl ? nameEl.innerText.trim() : "Name not found";
+    const bio = bioEl ? bioEl.innerText.trim() : "Bio not found";
+
+    const sections = {};
+    ['experience', 'education', 'skills'].forEach(kind => {
+        const section = document.getElementById(kind)?.closest('section');
+        if (section) sections[kind] = section;
+    });
+    await expandAll(Object.values(sections));
+
+    const result = { name, bio, experiences: [], education: [], skills: [], more: {} };
+    const keys = { experience: 'experiences', education: 'education', skills: 'skills' };
+    Object.entries(sections).forEach(([kind, section]) => {
+        result[keys[kind]] = readSection(kind, section);
+        const showAll = section.querySelector(`a[href*="/details/${kind}"]`);
+        if (showAll) result.more[kind] = showAll.href;
+    });
+
+    return JSON.stringify(result);
+})()
+"""
 
-        return JSON.stringify({ name, bio, experiences });
-    })()
+def details_script(kind):
+    """JavaScript that reads the full `kind` list on its "show all" details page"""
+    return """
+(async (kind) => {
+""" + _SECTION_HELPERS + """
+    const root = document.querySelector('main section');
+    if (!root) return JSON.stringify([]);
+    await expandAll([root]);
+    return JSON.stringify(readSection(kind, root));
+})(""" + json.dumps(kind) + ")"
+
+class NavigationWatcher:
+    """
+    Starts one navigation and waits for that navigation's document to load
+
+    Lifecycle events are matched on the frame and loader ids Page.navigate
+    returns, so a late event from the page being left (or from an iframe)
+    can't pass for the new page. Events that arrive before the Page.navigate
+    reply are kept and checked once the ids are known.
+    """
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.loaded = asyncio.Event()
+        self._navigation = None
+        self._early = []
+
+    def __enter__(self):
+        self.tab.on("Page.lifecycleEvent", self._on_lifecycle_event)
+        return self
+
+    def __exit__(self, *exc):
+        self.tab.off("Page.lifecycleEvent", self._on_lifecycle_event)
+
+    def _matches(self, params):
+        frame_id, loader_id = self._navigation
+        return params.get("frameId") == frame_id and params.get("loaderId") == loader_id
+
+    def _on_lifecycle_event(self, params):
+        if params.get("name") not in READY_LIFECYCLE_EVENTS:
+            return
+        if self._navigation is None:
+            self._early.append(params)
+        elif self._matches(params):
+            self.loaded.set()
+
+    async def navigate(self, url, _timeout=CDP_CALL_TIMEOUT):
+        """Send Page.navigate; needs Page lifecycle events enabled on the tab"""
+        result = await self.tab.send("Page.navigate", url=url, _timeout=_timeout)
+        if not result.get("loaderId"):
+            # Same-document navigation: no new document, so nothing to wait for
+            self.loaded.set()
+            return result
+        self._navigation = (result.get("frameId"), result["loaderId"])
+        if any(self._matches(params) for params in self._early):
+            self.loaded.set()
+        self._early = []
+        return result
+
+    async def wait(self, timeout):
+        """Wait for the navigated document; returns False if `timeout` ran out first"""
+        try:
+            await asyncio.wait_for(self.loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.loaded.is_set()
+
+
+async def navigate_and_wait(tab, url, timeout=READY_TIMEOUT, on_loaded=None, ready_script=READY_SCRIPT):
     """
+    Navigate `tab` to `url` and wait until the profile content is rendered
+
+    Readiness is driven by this navigation's CDP lifecycle events (see
+    NavigationWatcher) followed by an in-page wait for the name heading and
+    the experience list.
+
+    Args:
+        tab (CDPSession): Tab with Page (and its lifecycle events) and Runtime enabled
+        url (str): Page to load
+        timeout (float): Ceiling for the whole wait in seconds
+        on_loaded (callable): Optional coroutine function awaited once the
+            document is parsed, before waiting for the profile content
+        ready_script (str): In-page wait with a %d ms placeholder (READY_SCRIPT
+            for profile pages, DETAILS_READY_SCRIPT for "show all" pages)
+
+    Returns:
+        tuple: (ready, waited) where ready is False if the ceiling was hit
+    """
+    with NavigationWatcher(tab) as navigation:
+        start = time.monotonic()
+        with time_stage("navigate"):
+            await navigation.navigate(url)
+        navigated = time.monotonic()
+        loaded = await navigation.wait(timeout)
+
+        if on_loaded is not None and loaded:
+            await on_loaded()
+
+        ready = False
+        remaining = timeout - (time.monotonic() - start)
+        if remaining > 0:
+            result = await tab.send(
+                "Runtime.evaluate",
+                expression=ready_script % int(remaining * 1000),
+                awaitPromise=True,
+                returnByValue=True,
+                _timeout=remaining + 5
+            )
+            ready = bool(result.get("result", {}).get("value"))
+
+        waited = time.monotonic() - start
+        observe_stage("ready_wait", time.monotonic() - navigated)
+
+    return ready, waited
+
+
+class TabLeaseTimeout(Exception):
+    """Raised when no scraper tab becomes free within the lease timeout"""
+
+
+class PooledTab:
+    """An attached, Page/Runtime-enabled tab, its request blocker and how many times it has been used"""
+
+    def __init__(self, tab, blocker, generation):
+        self.tab = tab
+        self.blocker = blocker
+        self.generation = generation
+        self.navigations = 0
+
+
+class ScraperService:
+    """
+    Process-wide scraper state: one browser connection and a pool of warm tabs
+
+    All CDP traffic runs on a single asyncio event loop in a background thread,
+    with every tab multiplexed over one browser WebSocket, so concurrent scrapes
+    don't each pin an OS thread. Tabs are leased to one scrape at a time, reset
+    to about:blank when returned, and closed after `max_navigations` uses so
+    renderer memory does not pile up.
+    """
+
+    def __init__(self, debug_url=CHROME_DEBUG_URL, pool_size=TAB_POOL_SIZE,
+                 max_navigations=TAB_MAX_NAVIGATIONS):
+        self.debug_url = debug_url
+        self.pool_size = pool_size
+        self.max_navigations = max_navigations
+        self._browser = None
+        self._idle = None
+        self._connect_lock = None
+        self._open = 0
+        # Bumped whenever the pool forgets its tabs (reconnect, restart); tabs
+        # leased before that no longer count towards `_open`
+        self._generation = 0
+        self._closed = False
+        self._flights = {}
+        # Admission control: priority lanes for the tab slots, token buckets per domain
+        self.scheduler = PriorityScheduler(pool_size)
+        self.rate_limiter = DomainRateLimiter()
+        self.weight_baseline = WeightBaseline()
+        self._tab_ids = set()
+        self.supervisor = BrowserSupervisor(self)
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="cdp-loop")
+        self._thread.start()
+
+    # -- sync / async bridges -------------------------------------------------
+
+    def run(self, coro, timeout=None):
+        """Run `coro` on the service loop from any thread and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Scraper call did not finish within {timeout}s")
+
+    async def submit(self, coro):
+        """Await `coro` on the service loop from any event loop (cancellation propagates)"""
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    # -- tab pool (service loop only) -----------------------------------------
+
+    async def _get_browser(self):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+            self._idle = asyncio.LifoQueue()
+        async with self._connect_lock:
+            if self._browser is None or not self._browser.connected:
+                if self._browser is not None:
+                    # Tabs from a dead connection can't be reused
+                    self._idle = asyncio.LifoQueue()
+                    self._open = 0
+                    self._generation += 1
+                    self._tab_ids.clear()
+                self._browser = CDPBrowser(self.debug_url)
+                await self._browser.connect()
+            return self._browser
+
+    async def _open_tab(self, generation):
+        browser = await self._get_browser()
+        tab = await browser.new_tab()
+        self._tab_ids.add(tab.id)
+        self.supervisor.track_opened(tab.id)
+        try:
+            await tab.send("Page.enable")
+            await tab.send("Runtime.enable")
+            await tab.send("Page.setLifecycleEventsEnabled", enabled=True)
+            blocker = TabBlocker(tab)
+            await blocker.install()
+        except Exception:
+            await self._close_tab(tab)
+            raise
+        return PooledTab(tab, blocker, generation)
+
+    async def _close_tab(self, tab):
+        self._tab_ids.discard(tab.id)
+        try:
+            await self._browser.close_tab(tab)
+        except Exception as e:
+            logging.warning(f"Could not close scraper tab {tab.id}: {e}")
+
+    def _free_slot(self, generation):
+        # A slot taken before a reconnect was already given back by the reset
+        if generation == self._generation:
+            self._open -= 1
+
+    async def _drop_stale_tab(self, pooled):
+        """Close a tab left over from an earlier connection; Chrome may be gone already"""
+        self._tab_ids.discard(pooled.tab.id)
+        try:
+            await self._browser.close_tab(pooled.tab)
+        except Exception as e:
+            logging.debug(f"Could not close stale scraper tab {pooled.tab.id}: {e}")
+
+    async def _acquire(self, timeout):
+        await self._get_browser()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+
+            if self._open < self.pool_size:
+                self._open += 1
+                generation = self._generation
+                try:
+                    return await self._open_tab(generation)
+                except Exception:
+                    self._free_slot(generation)
+                    raise
+
+            # Wake up periodically in case a recycled tab freed a slot
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TabLeaseTimeout(f"No scraper tab free after {timeout}s ({self.pool_size} in use)")
+            try:
+                return await asyncio.wait_for(self._idle.get(), min(remaining, 0.5))
+            except asyncio.TimeoutError:
+                continue
+
+    async def _release(self, pooled, healthy):
+        pooled.navigations += 1
+        if (healthy and not self._closed and pooled.navigations < self.max_navigations
+                and pooled.generation == self._generation):
+            try:
+                # Drop the profile page so the idle tab holds no DOM or scripts; wait for
+                # about:blank to load so its events can't leak into the next lease
+                with NavigationWatcher(pooled.tab) as navigation:
+                    await navigation.navigate("about:blank", _timeout=5)
+                    if not await navigation.wait(5):
+                        raise TimeoutError("about:blank did not load within 5s")
+                if pooled.generation == self._generation:
+                    self._idle.put_nowait(pooled)
+                    return
+            except Exception as e:
+                logging.warning(f"Resetting scraper tab failed, recycling it: {e}")
+
+        if pooled.generation != self._generation:
+            # Leased before a reconnect or restart, which already gave its slot back
+            await self._drop_stale_tab(pooled)
+            return
+        await self._close_tab(pooled.tab)
+        self._open -= 1
+
+    @asynccontextmanager
+    async def lease(self, timeout=TAB_LEASE_TIMEOUT):
+        """Borrow a warm PooledTab for the duration of the `async with` block"""
+        if self._closed:
+            raise RuntimeError("Scraper service is shut down")
+        with time_stage("tab_acquire"):
+            pooled = await self._acquire(timeout)
+        healthy = False
+        try:
+            with SCRAPES_IN_FLIGHT.track_inprogress():
+                yield pooled
+            healthy = True
+        finally:
+            await self._release(pooled, healthy)
+
+    def pool_target_ids(self):
+        """Target ids of the pool's own tabs (the supervisor leaves these alone)"""
+        return set(self._tab_ids)
+
+    async def _drop_browser(self):
+        """Close Chrome itself and forget its tabs; only call with no tab leased"""
+        if self._browser is None:
+            return
+        try:
+            await self._browser.send("Browser.close", _timeout=5)
+        except Exception as e:
+            # The connection usually drops before the reply arrives
+            logging.debug(f"Browser.close: {e}")
+        await self._browser.close()
+        self._idle = asyncio.LifoQueue()
+        self._open = 0
+        self._generation += 1
+        self._tab_ids.clear()
+
+    async def _warm_up(self):
+        await self._get_browser()
+        while self._open < self.pool_size:
+            self._open += 1
+            generation = self._generation
+            try:
+                self._idle.put_nowait(await self._open_tab(generation))
+            except Exception:
+                self._free_slot(generation)
+                raise
+
+    def warm_up(self):
+        """Open tabs up to the pool size ahead of the first request"""
+        self.run(self._warm_up(), timeout=60)
+
+    async def _shutdown(self):
+        self._closed = True
+        if self._idle is not None:
+            while not self._idle.empty():
+                pooled = self._idle.get_nowait()
+                await self._close_tab(pooled.tab)
+                self._open -= 1
+        if self._browser is not None:
+            await self._browser.close()
+
+    def shutdown(self):
+        """Close every idle tab and the browser connection, then stop the loop"""
+        if not self.loop.is_running():
+            return
+        try:
+            self.run(self._shutdown(), timeout=10)
+        except Exception as e:
+            logging.warning(f"Scraper shutdown incomplete: {e}")
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_scraper_service():
+    """Return the process-wide ScraperService, creating it on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ScraperService()
+            atexit.register(_service.shutdown)
+        return _service
+
+class _Flight:
+    """One running scrape, shared by every caller that asked for the same URL meanwhile"""
+
+    def __init__(self):
+        self.task = None
+        self.ticket = None
+        self.waiters = 0
+        self.timings = {}
+        self.events = []
+        self.listeners = []
+
+    def report(self, event, data):
+        self.events.append((event, data))
+        for listener in list(self.listeners):
+            _report(listener, event, data)
+
+    def subscribe(self, on_progress):
+        # Late joiners first get the progress they missed
+        for event, data in self.events:
+            _report(on_progress, event, data)
+        self.listeners.append(on_progress)
+
+async def _scrape_single_flight(service, linkedin_url, ready_timeout, timings, on_progress=None,
+                                priority="interactive"):
+    """
+    Scrape `linkedin_url`, or join the scrape of it that is already running
+
+    Keyed on the URL being navigated to; callers going through the profile cache
+    pass the canonical URL, so variants of one profile share a scrape. Every
+    caller gets the same result or exception. Runs on the service loop only.
+    """
+    flight = service._flights.get(linkedin_url)
+    if flight is None:
+        flight = _Flight()
+        # Raises ScrapeQueueFull right away when the lane is full
+        flight.ticket = service.scheduler.enqueue(priority)
+        flight.task = service.loop.create_task(
+            _run_flight(service, flight, linkedin_url, ready_timeout)
+        )
+        service._flights[linkedin_url] = flight
+
+        def forget(task):
+            # Also covers a task cancelled before it ever ran
+            service.scheduler.discard(flight.ticket)
+            if service._flights.get(linkedin_url) is flight:
+                del service._flights[linkedin_url]
+
+        flight.task.add_done_callback(forget)
+        SCRAPE_REQUESTS.inc(flight="leader")
+    else:
+        # An interactive submit shouldn't wait behind the batch lane it joined
+        service.scheduler.promote(flight.ticket, priority)
+        SCRAPE_REQUESTS.inc(flight="coalesced")
+        logging.info(f"SCRAPE COALESCED: {linkedin_url} ({flight.waiters} already waiting)")
+
+    if on_progress is not None:
+        flight.subscribe(on_progress)
+    flight.waiters += 1
+    try:
+        # Shielded so one caller giving up doesn't cancel the others' scrape
+        return await asyncio.shield(flight.task)
+    except asyncio.CancelledError:
+        # Nobody is left to use the result: stop the scrape and free its tab
+        if flight.waiters == 1 and not flight.task.done():
+            flight.task.cancel()
+        raise
+    finally:
+        flight.waiters -= 1
+        if on_progress is not None:
+            flight.listeners.remove(on_progress)
+        if timings is not None:
+            timings.update(flight.timings)
+
+async def _run_flight(service, flight, linkedin_url, ready_timeout):
+    """Wait for the flight's scheduler slot, then scrape; queue wait is reported on its own"""
+    try:
+        start = time.monotonic()
+        await service.scheduler.wait(flight.ticket)
+        queued = time.monotonic() - start
+        flight.timings["scrape_queue_wait"] = round(queued, 3)
+        observe_stage("scrape_queue", queued)
+
+        start = time.monotonic()
+        try:
+            return await _scrape_with_retries(service, linkedin_url, ready_timeout, flight.timings, flight.report)
+        finally:
+            flight.timings["scrape_run"] = round(time.monotonic() - start, 3)
+    finally:
+        service.scheduler.discard(flight.ticket)
+
+async def _scrape_with_retries(service, linkedin_url, ready_timeout, timings, on_progress=None):
+    for attempt in range(SCRAPE_RETRIES_MAX + 1):
+        try:
+            # Borrow a warm tab from the shared pool (Chrome running on port 9222)
+            async with service.lease() as pooled:
+                return await _scrape_in_tab(service, pooled, linkedin_url, ready_timeout, timings, on_progress)
+        except TabLeaseTimeout:
+            SCRAPE_FAILURES.inc(reason="TabLeaseTimeout")
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            SCRAPE_FAILURES.inc(reason=type(e).__name__)
+            if attempt >= SCRAPE_RETRIES_MAX:
+                raise
+            # The failed tab was closed on release, so the retry gets a fresh one
+            SCRAPE_RETRIES.inc()
+            logging.warning(f"Scrape attempt {attempt + 1} failed for {linkedin_url}, retrying: {e}")
+
+async def async_scrape_linkedin_profile(linkedin_url, ready_timeout=READY_TIMEOUT, timings=None, on_progress=None,
+                                        priority="interactive"):
+    """
+    Scrape name, bio, experiences, education and skills from a LinkedIn profile (asyncio version)
+
+    Can be awaited from any event loop; the CDP work itself runs on the scraper
+    service loop. Concurrent calls for the same URL share one scrape, which is
+    cancelled once every caller awaiting it has been cancelled.
+
+    Args:
+        linkedin_url (str): Profile URL
+        ready_timeout (float): Ceiling for the page readiness wait in seconds
+        timings (dict): Optional dict that receives `ready_wait`, `scrape_queue_wait`,
+            `rate_limit_wait` and `scrape_run` (seconds)
+        on_progress (callable): Optional `on_progress(event, data)` for partial results
+        priority (str): Scheduler lane: "interactive", "batch" or "background"
+
+    Returns:
+        Profile: Name, bio, experiences, education and skills
+
+    Raises:
+        ScrapeQueueFull: if the priority lane already has too many scrapes waiting
+        ProfileDecodeError: if the page yields data of the wrong shape (after retries)
+    """
+    service = get_scraper_service()
+    return await service.submit(
+        _scrape_single_flight(service, linkedin_url, ready_timeout, timings, on_progress, priority)
+    )
+
+def scrape_linkedin_profile(linkedin_url, ready_timeout=READY_TIMEOUT, timings=None, timeout=SCRAPE_TIMEOUT,
+                            on_progress=None, priority="interactive"):
+    """
+    Scrape name, bio, experiences, education and skills from a LinkedIn profile
+
+    Blocking wrapper around async_scrape_linkedin_profile for thread-based callers;
+    concurrent calls for the same URL share one scrape.
+
+    Args:
+        linkedin_url (str): Profile URL
+        ready_timeout (float): Ceiling for the page readiness wait in seconds
+        timings (dict): Optional dict that receives `ready_wait`, `scrape_queue_wait`,
+            `rate_limit_wait` and `scrape_run` (seconds)
+        timeout (float): Ceiling for the whole scrape; the scrape is cancelled when it expires
+        on_progress (callable): Optional `on_progress(event, data)` for partial results.
+            Called from the scraper's event loop thread, so it must not block.
+        priority (str): Scheduler lane: "interactive", "batch" or "background"
+
+    Returns:
+        Profile: Name, bio, experiences, education and skills
+
+    Raises:
+        ScrapeQueueFull: if the priority lane already has too many scrapes waiting
+        ProfileDecodeError: if the page yields data of the wrong shape (after retries)
+    """
+    service = get_scraper_service()
+    return service.run(
+        _scrape_single_flight(service, linkedin_url, ready_timeout, timings, on_progress, priority), timeout=timeout
+    )
+
+def _report(on_progress, event, data):
+    try:
+        on_progress(event, data)
+    except Exception:
+        logging.exception(f"Scrape progress listener failed on {event}")
+
+async def _throttle(service, url, timings):
+    """Take a navigation token for `url`'s domain, accumulating the wait in `timings`"""
+    waited = await service.rate_limiter.wait(url)
+    observe_stage("rate_limit", waited)
+    if timings is not None:
+        timings["rate_limit_wait"] = round(timings.get("rate_limit_wait", 0) + waited, 3)
+
+async def _scrape_in_tab(service, pooled, linkedin_url, ready_timeout, timings, on_progress=None):
+    tab = pooled.tab
+
+    async def report_basics():
+        # Best effort: the full extraction below still returns everything
+        try:
+            result = await tab.send("Runtime.evaluate", expression=PROFILE_BASICS_SCRIPT, returnByValue=True)
+            basics = cdp_json(result)
+        except Exception as e:
+            logging.warning(f"Early profile read failed for {linkedin_url}: {e}")
+            return
+        if basics.get("name"):
+            _report(on_progress, "profile_basics", basics)
+
+    # Awaited by navigate_and_wait once the document has loaded
+    on_loaded = report_basics if on_progress is not None else None
+
+    # Wait for the page to render instead of sleeping a fixed amount
+    await _throttle(service, linkedin_url, timings)
+    # Occasionally load a profile unblocked so savings are measured against a real page
+    baseline = service.weight_baseline.due()
+    if baseline:
+        await pooled.blocker.set_blocking(False)
+    try:
+        async with pooled.blocker.measure() as weight:
+            ready, waited = await navigate_and_wait(tab, linkedin_url, ready_timeout, on_loaded)
+    finally:
+        if baseline:
+            await pooled.blocker.set_blocking(True)
+    service.weight_baseline.report(weight, timings)
+    if timings is not None:
+        timings["ready_wait"] = round(waited, 3)
+    if ready:
+        logging.info(f"PAGE READY after {waited:.2f}s: {linkedin_url}")
+    else:
+        logging.warning(f"PAGE NOT READY after {waited:.2f}s (ceiling {ready_timeout}s), scraping anyway: {linkedin_url}")
+
+    # Run the JavaScript to get the data (one pass over the profile sections)
+    with time_stage("extract"):
+        result = await tab.send(
+            "Runtime.evaluate", expression=EXTRACT_PROFILE_SCRIPT, awaitPromise=True, returnByValue=True
+        )
+        data = cdp_json(result)
+        profile = Profile.from_dict(data)
+    more = data.get("more") or {}
+    truncated = {kind: url for kind, url in more.items() if kind in FOLLOW_DETAILS}
+
+    if on_progress is not None:
+        for kind, key in SECTION_KEYS.items():
+            _report(on_progress, key, {key: getattr(profile, key), "complete": kind not in truncated})
+
+    # Short profiles are done here; only truncated sections cost another page load
+    for kind, details_url in truncated.items():
+        key = SECTION_KEYS[kind]
+        start = time.monotonic()
+        try:
+            await _throttle(service, details_url, timings)
+            with time_stage("details"):
+                entries = await _scrape_details(tab, details_url, kind, ready_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"Could not read all {kind} for {linkedin_url}, keeping the profile page list: {e}")
+            continue
+        if timings is not None:
+            timings[f"details_{kind}"] = round(time.monotonic() - start, 3)
+        if len(entries) >= len(getattr(profile, key)):
+            setattr(profile, key, entries)
+        if on_progress is not None:
+            _report(on_progress, key, {key: getattr(profile, key), "complete": True})
+
+    return profile
 
-    # Run the JavaScript to get the data
-    result = tab.call_method("Runtime.evaluate", expression=script, returnByValue=True)
-    data = json.loads(result['result']['value'])
-    tab.stop()
-    return data
+async def _scrape_details(tab, details_url, kind, ready_timeout):
+    """Read and validate the full `kind` list from its "show all" details page"""
+    ready, waited = await navigate_and_wait(tab, details_url, ready_timeout, ready_script=DETAILS_READY_SCRIPT)
+    if not ready:
+        logging.warning(f"DETAILS NOT READY after {waited:.2f}s, scraping anyway: {details_url}")
+    result = await tab.send(
+        "Runtime.evaluate", expression=details_script(kind), awaitPromise=True, returnByValue=True
+    )
+    return decode_section(SECTION_KEYS[kind], cdp_json(result))
@@ -0,0 +1,251 @@
+"""
+Logging for the backend: queued, structured and rotated
+
+Log calls only put the record on an in-memory queue; a QueueListener thread
+formats it and does the file I/O, so request and job threads never wait on
+the disk. Records are written as one JSON object per line and carry the id
+and current stage of the job that logged them (plus any `extra=` fields such
+as stage timings). The app log and the Werkzeug access log go to separate
+files, each rotated by size and by age and gzipped on rotation.
+"""
+import os
+import sys
+import copy
+import glob
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import logging
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, BaseRotatingHandler
+
+# Log destinations and level (override with environment variables)
+LOG_FILE = os.environ.get("LOG_FILE", "scrape.log")
+ACCESS_LOG_FILE = os.environ.get("ACCESS_LOG_FILE", "access.log")
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+# "json" (one object per line) or "text" (the old `time - LEVEL - message` lines)
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+
+# Rotate when a file reaches LOG_MAX_BYTES or is LOG_ROTATE_HOURS old, whichever
+# comes first (0 disables either); keep LOG_BACKUP_COUNT gzipped old files
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_ROTATE_HOURS = float(os.environ.get("LOG_ROTATE_HOURS", "24"))
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", "14"))
+
+# Print per-request profile dumps and progress lines to the console;
+# set VERBOSE_CONSOLE=0 in production
+VERBOSE_CONSOLE = os.environ.get("VERBOSE_CONSOLE", "1") == "1"
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# Job the current thread is working on, set by the job manager
+_current_job = contextvars.ContextVar("current_job", default=None)
+
+_listener = None
+
+
+@contextmanager
+def job_context(job):
+    """Tag every record logged inside the block with `job`'s id and stage"""
+    token = _current_job.set(job)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+def console(message):
+    """Print a verbose progress line unless VERBOSE_CONSOLE is off"""
+    if VERBOSE_CONSOLE:
+        print(message)
+
+
+class JobContextFilter(logging.Filter):
+    """Adds `job_id` and `stage` from the job context; runs on the calling thread (attached to the QueueHandler)"""
+
+    def filter(self, record):
+        job = _current_job.get()
+        if job is not None:
+            if not hasattr(record, "job_id"):
+                record.job_id = job.id
+            if not hasattr(record, "stage"):
+                record.stage = job.stage
+        return True
+
+
+class LoggerNameFilter(logging.Filter):
+    """Passes records from the `names` loggers (and their children), or all others with `exclude`"""
+
+    def __init__(self, names, exclude=False):
+        super().__init__()
+        self.names = tuple(names)
+        self.exclude = exclude
+
+    def filter(self, record):
+        matched = any(record.name == name or record.name.startswith(name + ".") for name in self.names)
+        return matched != self.exclude
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, thread, message and extras"""
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps extras and the traceback as separate fields
+
+    The stock `prepare` folds the traceback into the message; here the message
+    and traceback are rendered to text on the calling thread (args may not be
+    safe to format later) and everything else is left for the formatter.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """
+    Rotates on size and on age; old files are renamed with a timestamp and gzipped
+
+    Runs on the listener thread, so rotation and compression never block a
+    request.
+    """
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, rotate_hours=LOG_ROTATE_HOURS,
+                 backup_count=LOG_BACKUP_COUNT):
+        super().__init__(filename, "a", encoding="utf-8", delay=True)
+        self.max_bytes = max_bytes
+        self.interval = rotate_hours * 3600
+        self.backup_count = backup_count
+        self.rollover_at = self._next_rollover()
+
+    def _next_rollover(self):
+        if self.interval <= 0:
+            return float("inf")
+        # A file left over from an earlier run is rotated once it is interval old
+        try:
+            started = os.path.getmtime(self.baseFilename) if os.path.getsize(self.baseFilename) else time.time()
+        except OSError:
+            started = time.time()
+        return min(started, time.time()) + self.interval
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+
+    def doRollover(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            target = f"{self.baseFilename}.{stamp}"
+            suffix = 1
+            while os.path.exists(target + ".gz"):
+                target = f"{self.baseFilename}.{stamp}-{suffix}"
+                suffix += 1
+            self.rotate(self.baseFilename, target)
+            self._prune()
+        self.rollover_at = time.time() + self.interval if self.interval > 0 else float("inf")
+
+    def rotator(self, source, dest):
+        os.rename(source, dest)
+        try:
+            with open(dest, "rb") as src, gzip.open(dest + ".gz", "wb") as out:
+                shutil.copyfileobj(src, out)
+            os.remove(dest)
+        except OSError as e:
+            # Keep the uncompressed file rather than lose it
+            print(f"⚠️ Could not compress rotated log {dest}: {e}", file=sys.stderr)
+
+    def _prune(self):
+        if self.backup_count <= 0:
+            return
+        old = sorted(glob.glob(glob.escape(self.baseFilename) + ".*"), key=os.path.getmtime)
+        for path in old[:-self.backup_count]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _file_handler(path, formatter, name_filter):
+    handler = CompressingRotatingFileHandler(path)
+    handler.setFormatter(formatter)
+    handler.addFilter(name_filter)
+    return handler
+
+def setup_logging(log_file=LOG_FILE, access_log_file=ACCESS_LOG_FILE, level=LOG_LEVEL, fmt=LOG_FORMAT):
+    """
+    Route the root logger through a queue to rotating app and access log files
+
+    Safe to call more than once; only the first call configures anything.
+    The listener is flushed and stopped at interpreter exit.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [_file_handler(log_file, formatter, LoggerNameFilter(["werkzeug"], exclude=True))]
+    if access_log_file:
+        handlers.append(_file_handler(access_log_file, formatter, LoggerNameFilter(["werkzeug"])))
+    else:
+        handlers[0].filters.clear()
+
+    records = queue.Queue(-1)
+    queue_handler = StructuredQueueHandler(records)
+    queue_handler.addFilter(JobContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
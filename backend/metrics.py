@@ -0,0 +1,238 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from a fast in-page call up to a slow page load
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named metric with optional labels, rendered in Prometheus text format"""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames and self.type != "histogram":
+            self._values[()] = 0
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        with self._lock:
+            return [(self.name, key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for name, key, extra, value in self._samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block, even when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, (), total))
+            samples.append((f"{self.name}_count", key, (), cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Pipeline metrics shared by the server, scraper and automation client
+STAGE_SECONDS = Histogram(
+    "interview_stage_seconds",
+    "Time spent in each interview setup stage",
+    ["stage"]
+)
+SCRAPE_FAILURES = Counter(
+    "scrape_failures_total",
+    "Profile scrapes that raised, by exception type",
+    ["reason"]
+)
+SCRAPE_RETRIES = Counter(
+    "scrape_retries_total",
+    "Profile scrapes retried on a fresh tab"
+)
+SCRAPE_REQUESTS = Counter(
+    "scrape_requests_total",
+    "Scrape requests by whether they started a scrape or joined an identical one in flight",
+    ["flight"]
+)
+SCRAPE_QUEUE_DEPTH = Gauge(
+    "scrape_queue_depth",
+    "Scrapes waiting for a browser slot by priority lane",
+    ["lane"]
+)
+SCRAPE_REJECTED = Counter(
+    "scrape_rejected_total",
+    "Scrapes turned away because their priority lane was full",
+    ["lane"]
+)
+SCRAPE_PAGE_BYTES = Counter(
+    "scrape_page_bytes_total",
+    "Bytes transferred for profile pages (loaded) and estimated bytes avoided by blocking (saved)",
+    ["kind"]
+)
+SCRAPE_BLOCKED_REQUESTS = Counter(
+    "scrape_blocked_requests_total",
+    "Requests blocked in scraper tabs by resource type",
+    ["type"]
+)
+SCRAPES_IN_FLIGHT = Gauge(
+    "scrapes_in_flight",
+    "Scrapes currently holding a browser tab"
+)
+CHROME_MEMORY = Gauge(
+    "chrome_memory_bytes",
+    "Memory of the shared Chrome: process RSS (total) and JS heap used by all tabs (js_heap)",
+    ["scope"]
+)
+CHROME_TABS = Gauge(
+    "chrome_tabs",
+    "Open page targets in the shared Chrome"
+)
+CHROME_TABS_CLOSED = Counter(
+    "chrome_tabs_closed_total",
+    "Tabs closed by the browser supervisor",
+    ["reason"]
+)
+CHROME_MEMORY_RECLAIMED = Counter(
+    "chrome_memory_reclaimed_bytes_total",
+    "Memory freed by the browser supervisor, by action",
+    ["action"]
+)
+CHROME_RESTARTS = Counter(
+    "chrome_restarts_total",
+    "Supervisor-triggered Chrome restarts by result",
+    ["result"]
+)
+PROMPT_TOKENS = Histogram(
+    "prompt_candidate_tokens",
+    "Estimated tokens of the candidate section before (original) and after (compacted) budgeting",
+    ["kind"],
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 5000, 10000, 20000)
+)
+JOBS_IN_FLIGHT = Gauge(
+    "interview_jobs_in_flight",
+    "Interview setup jobs by state",
+    ["state"]
+)
+JOBS_FINISHED = Counter(
+    "interview_jobs_total",
+    "Finished interview setup jobs by status",
+    ["status"]
+)
+
+def time_stage(stage):
+    """Context manager recording the duration of `stage` in STAGE_SECONDS"""
+    return STAGE_SECONDS.time(stage=stage)
+
+def observe_stage(stage, seconds):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+def render_metrics():
+    """All registered metrics in the Prometheus text exposition format"""
+    return REGISTRY.render()
@@ -0,0 +1,216 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from urllib.parse import urlsplit, unquote
+
+from linkedin_scraper import scrape_linkedin_profile
+from profile_model import Profile, ProfileDecodeError
+
+# Cache settings (override with environment variables)
+CACHE_DB_PATH = os.environ.get("PROFILE_CACHE_DB", "profile_cache.db")
+CACHE_TTL_SECONDS = int(os.environ.get("PROFILE_CACHE_TTL", str(24 * 3600)))
+CACHE_MEMORY_ENTRIES = int(os.environ.get("PROFILE_CACHE_MEMORY_ENTRIES", "256"))
+
+# Profile pages live under /in/<slug>; anything after the slug is a sub-view.
+# Legacy /pub/<name>/<a>/<b>/<c> URLs need the whole path to tell people apart,
+# so they are left as they are.
+PROFILE_PATH_RE = re.compile(r"^/in/([^/]+)")
+
+
+def canonicalize_linkedin_url(url):
+    """
+    Normalize a LinkedIn profile URL so equivalent inputs share one cache key
+
+    `linkedin.com/in/X`, `https://pk.linkedin.com/in/x/` and
+    `https://www.linkedin.com/in/x/?trk=abc#top` all become
+    `https://www.linkedin.com/in/x`. Legacy `/pub/` URLs keep their full path.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    path = unquote(parts.path).lower().rstrip("/")
+
+    # Country subdomains (pk., uk., ...) serve the same profiles
+    if host == "linkedin.com" or host.endswith(".linkedin.com"):
+        host = "www.linkedin.com"
+
+    match = PROFILE_PATH_RE.match(path)
+    if match:
+        path = f"/in/{match.group(1)}"
+
+    return f"https://{host}{path}"
+
+
+class ProfileCache:
+    """
+    Two-tier cache of scraped profiles keyed by canonical URL
+
+    An in-memory LRU of decoded Profile objects sits in front of a SQLite
+    table of their JSON; every entry carries its own expiry so stale profiles
+    are never served from either tier.
+    """
+
+    def __init__(self, db_path=CACHE_DB_PATH, ttl=CACHE_TTL_SECONDS,
+                 max_entries=CACHE_MEMORY_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "refreshes": 0,
+            "bypasses": 0,
+            "evictions": 0,
+            "writes": 0,
+        }
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                url TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, url):
+        """Return the cached profile for a canonical URL, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                profile, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(url)
+                    self._counters["memory_hits"] += 1
+                    return profile
+                del self._memory[url]
+                self._counters["expired"] += 1
+
+            row = self._db.execute(
+                "SELECT data, expires_at FROM profiles WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                try:
+                    profile = Profile.from_json(row[0])
+                except ProfileDecodeError as e:
+                    logging.warning(f"CACHE: dropping unreadable entry for {url}: {e}")
+                    profile = None
+                if profile is not None:
+                    self._remember(url, profile, row[1])
+                    self._counters["disk_hits"] += 1
+                    return profile
+            if row is not None:
+                self._db.execute("DELETE FROM profiles WHERE url = ?", (url,))
+                self._db.commit()
+                self._counters["expired"] += 1
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, url, profile, ttl=None):
+        """Store a profile in both tiers with its own time-to-live"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(url, profile, expires_at)
+            self._db.execute(
+                "INSERT OR REPLACE INTO profiles (url, data, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                (url, profile.to_json(), now, expires_at)
+            )
+            self._db.commit()
+            self._counters["writes"] += 1
+
+    def invalidate(self, url):
+        with self._lock:
+            self._memory.pop(url, None)
+            self._db.execute("DELETE FROM profiles WHERE url = ?", (url,))
+            self._db.commit()
+
+    def count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _remember(self, url, profile, expires_at):
+        """Insert into the LRU tier (caller holds the lock)"""
+        self._memory[url] = (profile, expires_at)
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_profile_cache():
+    """Return the process-wide ProfileCache, creating it on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ProfileCache()
+        return _cache
+
+def scrape_with_cache(linkedin_url, refresh=False, bypass=False, timings=None, on_progress=None,
+                      priority="interactive"):
+    """
+    Scrape a profile through the cache
+
+    Args:
+        linkedin_url (str): Profile URL as submitted
+        refresh (bool): Skip the cache lookup and overwrite the entry with a fresh scrape
+        bypass (bool): Neither read from nor write to the cache
+        timings (dict): Passed through to scrape_linkedin_profile
+        on_progress (callable): Passed through to scrape_linkedin_profile (not called on a hit)
+        priority (str): Scheduler lane for a scrape: "interactive", "batch" or "background"
+
+    Returns:
+        tuple: (profile, cache_status) where profile is a Profile and cache_status is
+        "hit", "miss", "refresh" or "bypass"
+    """
+    cache = get_profile_cache()
+    url = canonicalize_linkedin_url(linkedin_url)
+
+    if bypass:
+        cache.count("bypasses")
+        return scrape_linkedin_profile(url, timings=timings, on_progress=on_progress, priority=priority), "bypass"
+
+    if refresh:
+        cache.count("refreshes")
+        status = "refresh"
+    else:
+        profile = cache.get(url)
+        if profile is not None:
+            logging.info(f"CACHE HIT: {url}")
+            return profile, "hit"
+        status = "miss"
+
+    profile = scrape_linkedin_profile(url, timings=timings, on_progress=on_progress, priority=priority)
+
+    # Don't pin a failed render in the cache for a whole TTL
+    if profile.name not in ("", "Name not found"):
+        cache.put(url, profile)
+
+    return profile, status
@@ -0,0 +1,188 @@
+"""
+Typed profile model shared by the scraper, the cache, prompt formatting and the API
+
+A scraped profile is decoded and validated once, straight from the CDP
+`Runtime.evaluate` result, into slotted dataclasses. Everything downstream
+reads attributes instead of re-checking dict keys, and encoding back to JSON
+(cache rows, job events, API responses) goes through `dumps`, which uses
+orjson when it is installed.
+"""
+import json
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # optional: the standard json module is used without it
+    orjson = None
+
+
+class ProfileDecodeError(ValueError):
+    """Raised when scraped or cached profile data does not have the expected shape"""
+
+
+def _plain(obj):
+    # json.dumps fallback for the model classes (orjson serializes dataclasses natively)
+    if isinstance(obj, (Profile, Experience, Education)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj):
+    """Encode `obj` (which may contain profile model objects) as a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, default=_plain, ensure_ascii=False, separators=(",", ":"))
+
+def loads(raw):
+    """Decode a JSON string or bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def cdp_json(result):
+    """
+    Decode the JSON string a `Runtime.evaluate` call returned by value
+
+    Raises:
+        ProfileDecodeError: if the script threw or did not return a JSON string
+    """
+    if result.get("exceptionDetails"):
+        details = result["exceptionDetails"]
+        message = details.get("exception", {}).get("description") or details.get("text", "unknown error")
+        raise ProfileDecodeError(f"Extraction script failed: {message}")
+    value = result.get("result", {}).get("value")
+    if not isinstance(value, str):
+        raise ProfileDecodeError(f"Extraction script returned {type(value).__name__}, expected a JSON string")
+    try:
+        return loads(value)
+    except ValueError as e:
+        raise ProfileDecodeError(f"Extraction script returned invalid JSON: {e}")
+
+
+def _text(data, key, where, default=""):
+    value = data.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ProfileDecodeError(f"{where}.{key} must be a string, got {type(value).__name__}")
+    return value
+
+def _entries(data, key, decode):
+    value = data.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ProfileDecodeError(f"{key} must be a list, got {type(value).__name__}")
+    return [decode(item, f"{key}[{idx}]") for idx, item in enumerate(value)]
+
+def _object(item, where):
+    if not isinstance(item, dict):
+        raise ProfileDecodeError(f"{where} must be an object, got {type(item).__name__}")
+    return item
+
+
+# Fields have no defaults so the manual __slots__ work on Python 3.8;
+# build instances through from_dict, which fills in missing fields.
+
+@dataclass
+class Experience:
+    __slots__ = ("designation", "company", "duration", "detail")
+    designation: str
+    company: str
+    duration: str
+    detail: str
+
+    @classmethod
+    def from_dict(cls, item, where="experience"):
+        item = _object(item, where)
+        return cls(
+            _text(item, "designation", where), _text(item, "company", where),
+            _text(item, "duration", where), _text(item, "detail", where)
+        )
+
+    def to_dict(self):
+        return {"designation": self.designation, "company": self.company,
+                "duration": self.duration, "detail": self.detail}
+
+
+@dataclass
+class Education:
+    __slots__ = ("degree", "school", "duration")
+    degree: str
+    school: str
+    duration: str
+
+    @classmethod
+    def from_dict(cls, item, where="education"):
+        item = _object(item, where)
+        return cls(_text(item, "degree", where), _text(item, "school", where), _text(item, "duration", where))
+
+    def to_dict(self):
+        return {"degree": self.degree, "school": self.school, "duration": self.duration}
+
+
+def _skill(item, where):
+    if not isinstance(item, str):
+        raise ProfileDecodeError(f"{where} must be a string, got {type(item).__name__}")
+    return item
+
+# Profile attribute -> decoder for one entry of that section
+SECTION_DECODERS = {
+    "experiences": Experience.from_dict,
+    "education": Education.from_dict,
+    "skills": _skill,
+}
+
+def decode_section(key, value):
+    """Validate one section list (`key` is "experiences", "education" or "skills")"""
+    return _entries({key: value}, key, SECTION_DECODERS[key])
+
+def encode_section(entries):
+    """Plain JSON-ready list for a section (skills are already strings)"""
+    return [entry.to_dict() if isinstance(entry, (Experience, Education)) else entry for entry in entries]
+
+
+@dataclass
+class Profile:
+    __slots__ = ("name", "bio", "experiences", "education", "skills")
+    name: str
+    bio: str
+    experiences: list
+    education: list
+    skills: list
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Validate and convert a scraped or cached profile dict
+
+        Raises:
+            ProfileDecodeError: if a field has the wrong type
+        """
+        data = _object(data, "profile")
+        return cls(
+            _text(data, "name", "profile", "Name not found"),
+            _text(data, "bio", "profile", "Bio not found"),
+            _entries(data, "experiences", Experience.from_dict),
+            _entries(data, "education", Education.from_dict),
+            _entries(data, "skills", _skill),
+        )
+
+    @classmethod
+    def from_json(cls, raw):
+        try:
+            data = loads(raw)
+        except ValueError as e:
+            raise ProfileDecodeError(f"Invalid profile JSON: {e}")
+        return cls.from_dict(data)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "bio": self.bio,
+            "experiences": encode_section(self.experiences),
+            "education": encode_section(self.education),
+            "skills": list(self.skills),
+        }
+
+    def to_json(self):
+        return dumps(self)
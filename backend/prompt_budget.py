@@ -0,0 +1,157 @@
+"""
+Token budget for the candidate section of the interview prompt
+
+Long experience descriptions used to go into the prompt verbatim, which made
+the assistant slower to answer and dearer on every turn. In budget mode the
+details are cleaned up (whitespace, LinkedIn boilerplate) and, when the
+section is still over budget, the roles most worth asking about (recent ones
+and ones that match the job title) keep their details while the rest are cut
+down to a sentence or dropped. Roles stay in their original order in the
+prompt; the ranking only decides who gets the tokens.
+"""
+import os
+import re
+
+# Estimated tokens allowed for the whole candidate section (0 disables budget mode)
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "1500"))
+
+# Rough size of a token in English text; good enough to budget with, far
+# cheaper than running a tokenizer on every request
+CHARS_PER_TOKEN = 4
+
+# Every kept role gets at least this much detail before the top roles get more
+MIN_DETAIL_TOKENS = int(os.environ.get("PROMPT_MIN_DETAIL_TOKENS", "30"))
+
+# Labels and indentation around one role ("1. X at Y", "Duration:", "Details:")
+ROLE_OVERHEAD_TOKENS = 10
+
+# Weight of job-title relevance against recency when ranking roles
+RELEVANCE_WEIGHT = 2.0
+
+# Text LinkedIn adds around descriptions that says nothing about the candidate
+BOILERPLATE_RE = re.compile(
+    r"…\s*(?:see more|more)\b|\b(?:see|show) (?:more|less)\b|\bShow all \d+ \w+",
+    re.IGNORECASE
+)
+# Words any boilerplate match contains; the regex only runs when one is present
+BOILERPLATE_HINTS = ("more", "less", "show all")
+BULLET_RE = re.compile(r"\n\s*[•·▪◦●\-*]\s+")
+SENTENCE_END_RE = re.compile(r"[.!?;](?:\s|$)")
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Words in job titles that say nothing about the role itself
+TITLE_STOPWORDS = {
+    "and", "the", "for", "of", "in", "at", "to", "a", "an", "senior", "junior", "sr", "jr",
+    "lead", "head", "intern", "associate", "assistant", "i", "ii", "iii",
+}
+
+
+def tokens_for_chars(chars):
+    return (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def estimate_tokens(text):
+    """Fast token estimate: about one token per four characters"""
+    return tokens_for_chars(len(text))
+
+def normalize_text(text):
+    """Drop LinkedIn boilerplate, turn bullet lines into "; " and collapse whitespace"""
+    if not text:
+        return ""
+    lowered = text.lower()
+    if any(hint in lowered for hint in BOILERPLATE_HINTS):
+        text = BOILERPLATE_RE.sub(" ", text)
+    if "\n" in text:
+        text = BULLET_RE.sub("; ", text)
+    return " ".join(text.split()).replace(" ;", ";").strip(" ;")
+
+def truncate_to_tokens(text, tokens):
+    """Cut `text` to about `tokens`, preferring a sentence end, then a word boundary"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    if limit <= 1:
+        return ""
+    cut = text[:limit - 1]
+    ends = [m.end() for m in SENTENCE_END_RE.finditer(cut)]
+    # Only back up to a sentence end if that keeps most of the allowance
+    if ends and ends[-1] >= limit // 2:
+        return cut[:ends[-1]].rstrip()
+    space = cut.rfind(" ")
+    if space >= limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:-") + "…"
+
+def _title_terms(job_title):
+    return {word for word in WORD_RE.findall((job_title or "").lower()) if word not in TITLE_STOPWORDS}
+
+def _relevance(exp, detail, terms):
+    """Share of the job title's words found in the role (designation counts double)"""
+    if not terms:
+        return 0.0
+    designation = set(WORD_RE.findall(exp.designation.lower()))
+    # Substring checks keep this linear in the detail length; "analyst" also matches "analysts"
+    detail = detail.lower()
+    return sum(2 if term in designation else 1 if term in detail else 0 for term in terms) / (2 * len(terms))
+
+def _recency(position, exp):
+    """Scraped roles are newest first; a current role ("Present") gets a bonus"""
+    return 1.0 / (1 + position) + (0.5 if "present" in exp.duration.lower() else 0.0)
+
+
+def rank_experiences(experiences, job_title, details=None):
+    """Indexes of `experiences`, most worth the prompt's tokens first"""
+    terms = _title_terms(job_title)
+    details = details if details is not None else [exp.detail for exp in experiences]
+    scores = [
+        RELEVANCE_WEIGHT * _relevance(exp, details[idx], terms) + _recency(idx, exp)
+        for idx, exp in enumerate(experiences)
+    ]
+    return sorted(range(len(experiences)), key=lambda idx: -scores[idx])
+
+def compact_experiences(experiences, job_title, budget_tokens):
+    """
+    Fit the experience entries into `budget_tokens`
+
+    Args:
+        experiences (list): Experience entries, newest first
+        job_title (str): Job title the roles are ranked against
+        budget_tokens (int): Estimated tokens available for all roles
+
+    Returns:
+        tuple: (kept, omitted) where kept is a list of (experience, detail) in
+        the original order, detail being the normalized and possibly shortened
+        text, and omitted is the number of roles left out entirely
+    """
+    details = [normalize_text(exp.detail) for exp in experiences]
+    header_costs = [
+        ROLE_OVERHEAD_TOKENS + estimate_tokens(exp.designation + exp.company + exp.duration)
+        for exp in experiences
+    ]
+    detail_costs = [estimate_tokens(detail) for detail in details]
+    if sum(header_costs) + sum(detail_costs) <= budget_tokens:
+        return list(zip(experiences, details)), 0
+
+    order = rank_experiences(experiences, job_title, details)
+
+    # Keep as many roles as fit with a sentence of detail each, best ranked first
+    remaining = budget_tokens
+    allowed = {}
+    for idx in order:
+        stub = min(detail_costs[idx], MIN_DETAIL_TOKENS)
+        if header_costs[idx] + stub > remaining:
+            break
+        remaining -= header_costs[idx] + stub
+        allowed[idx] = stub
+    kept = list(allowed)
+
+    # Then the best ranked roles get their full details while tokens last
+    for idx in kept:
+        grant = min(detail_costs[idx] - allowed[idx], remaining)
+        allowed[idx] += grant
+        remaining -= grant
+
+    result = [
+        (experiences[idx], truncate_to_tokens(details[idx], allowed[idx]))
+        for idx in sorted(kept)
+    ]
+    return result, len(experiences) - len(kept)
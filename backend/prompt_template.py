@@ -0,0 +1,101 @@
+import os
+import threading
+import logging
+
+from log_setup import console
+
+# Placeholder markers in the interview prompt: each slot is the empty
+# back-quoted block after its label, and rendering fills in between the quotes
+SLOT_MARKERS = {
+    "client_data": ("Client data=  \n`", "\n`"),
+    "job_title": ("Job Title= \n`", "\n`"),
+}
+
+
+class PromptTemplateError(Exception):
+    """Raised when a prompt template is missing placeholders or values"""
+
+
+class CompiledTemplate:
+    """
+    A prompt template parsed once into literal text and named slots
+
+    Rendering is a single join over the parts, so the template text is never
+    scanned again per request.
+    """
+
+    def __init__(self, source, name="<template>", required=tuple(SLOT_MARKERS)):
+        self.source = source
+        self.name = name
+        self.parts = self._compile(source)
+        self.slots = {part[1] for part in self.parts if isinstance(part, tuple)}
+
+        missing = [slot for slot in required if slot not in self.slots]
+        if missing:
+            expected = ", ".join(repr("".join(SLOT_MARKERS[slot])) for slot in missing)
+            raise PromptTemplateError(f"{name} is missing placeholder(s) {', '.join(missing)} (expected {expected})")
+
+    @staticmethod
+    def _compile(source):
+        """Split `source` into literal strings and ("slot", name) tuples"""
+        found = []
+        for slot, (prefix, suffix) in SLOT_MARKERS.items():
+            marker = prefix + suffix
+            start = source.find(marker)
+            while start != -1:
+                found.append((start, start + len(prefix), slot, len(marker)))
+                start = source.find(marker, start + len(marker))
+        found.sort()
+
+        parts = []
+        pos = 0
+        for start, slot_at, slot, length in found:
+            if start < pos:
+                continue  # overlapping markers: keep the first
+            parts.append(source[pos:slot_at])
+            parts.append(("slot", slot))
+            pos = slot_at
+            # The suffix stays as literal text after the slot
+        parts.append(source[pos:])
+        return [part for part in parts if part != ""]
+
+    def render(self, **values):
+        missing = self.slots - values.keys()
+        if missing:
+            raise PromptTemplateError(f"No value for placeholder(s) {', '.join(sorted(missing))} in {self.name}")
+        return "".join(values[part[1]] if isinstance(part, tuple) else part for part in self.parts)
+
+
+class TemplateLoader:
+    """
+    Keeps the compiled prompt template for a file, recompiling only when the
+    file's mtime or size changes; falls back to a built-in default when the
+    file does not exist
+    """
+
+    def __init__(self, path, default_source):
+        self.path = path
+        self.default_source = default_source
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._template = None
+
+    def get(self):
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = "default"
+
+        with self._lock:
+            if stamp != self._stamp:
+                if stamp == "default":
+                    console(f"❌ Warning: {self.path} not found. Using default prompt.")
+                    logging.warning(f"{self.path} not found, using the default prompt")
+                    self._template = CompiledTemplate(self.default_source, name="default prompt")
+                else:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._template = CompiledTemplate(f.read(), name=self.path)
+                    logging.info(f"Compiled prompt template {self.path}")
+                self._stamp = stamp
+            return self._template
@@ -0,0 +1,203 @@
+"""
+Request blocking and page-weight accounting for scraper tabs
+
+The extraction script only needs the DOM, so trackers and ad beacons are
+blocked by URL pattern (Network.setBlockedURLs) and, in lightweight mode,
+images, media and fonts are failed by resource type through the Fetch domain.
+Every profile load is measured (bytes transferred, requests blocked, time to
+the load event); now and then one load runs unblocked to keep a baseline, so
+each scrape can report the bytes and load time that blocking saved.
+"""
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from metrics import observe_stage, SCRAPE_PAGE_BYTES, SCRAPE_BLOCKED_REQUESTS
+
+
+def _env_list(name, default):
+    return [item.strip() for item in os.environ.get(name, default).split(",") if item.strip()]
+
+# URL patterns never worth loading for a scrape (comma separated, * wildcards)
+BLOCKED_URL_PATTERNS = _env_list("SCRAPE_BLOCKED_URLS", ",".join([
+    "*doubleclick.net*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*facebook.net*",
+    "*bat.bing.com*",
+    "*ads.linkedin.com*",
+    "*linkedin.com/li/track*",
+    "*linkedin.com/litms/*",
+    "*linkedin.com/sensorCollect*",
+]))
+
+# CDP resource types failed outright (Image, Media, Font, Stylesheet, ...)
+BLOCKED_RESOURCE_TYPES = _env_list("SCRAPE_BLOCKED_RESOURCE_TYPES", "")
+
+# Lightweight mode: also drop images, video/audio and web fonts
+LIGHTWEIGHT_MODE = os.environ.get("SCRAPE_LIGHTWEIGHT", "1") == "1"
+LIGHTWEIGHT_RESOURCE_TYPES = ("Image", "Media", "Font")
+
+# Every Nth profile load runs unblocked to refresh the baseline (0 disables)
+BASELINE_EVERY = int(os.environ.get("SCRAPE_WEIGHT_BASELINE_EVERY", "25"))
+
+# Weight of the newest unblocked load in the running baseline
+BASELINE_SMOOTHING = 0.3
+
+
+def blocked_resource_types():
+    types = list(BLOCKED_RESOURCE_TYPES)
+    if LIGHTWEIGHT_MODE:
+        types += [t for t in LIGHTWEIGHT_RESOURCE_TYPES if t not in types]
+    return types
+
+
+class TabBlocker:
+    """Installs and toggles request blocking on one tab"""
+
+    def __init__(self, tab, url_patterns=None, resource_types=None):
+        self.tab = tab
+        self.url_patterns = BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns
+        self.resource_types = blocked_resource_types() if resource_types is None else resource_types
+        self.blocking = False
+        self._failing = set()
+
+    async def install(self):
+        """Enable Network events and turn blocking on; call once per tab"""
+        await self.tab.send("Network.enable")
+        self.tab.on("Fetch.requestPaused", self._on_request_paused)
+        await self.set_blocking(True)
+
+    async def set_blocking(self, enabled):
+        if enabled == self.blocking:
+            return
+        await self.tab.send("Network.setBlockedURLs", urls=self.url_patterns if enabled else [])
+        if self.resource_types:
+            if enabled:
+                # Only requests of the blocked types are paused, so every pause is a block
+                await self.tab.send("Fetch.enable", patterns=[
+                    {"urlPattern": "*", "resourceType": resource_type, "requestStage": "Request"}
+                    for resource_type in self.resource_types
+                ])
+            else:
+                await self.tab.send("Fetch.disable")
+        self.blocking = enabled
+
+    def _on_request_paused(self, params):
+        # Listeners are synchronous; answer the pause from a task on the same loop
+        task = asyncio.get_running_loop().create_task(self._fail(params["requestId"]))
+        self._failing.add(task)
+        task.add_done_callback(self._failing.discard)
+
+    async def _fail(self, request_id):
+        try:
+            await self.tab.send("Fetch.failRequest", requestId=request_id, errorReason="BlockedByClient", _timeout=5)
+        except Exception as e:
+            # The page may have navigated away already
+            logging.debug(f"Could not fail paused request {request_id}: {e}")
+
+    @asynccontextmanager
+    async def measure(self):
+        """Collect a PageWeight for the navigation made inside the block"""
+        weight = PageWeight(blocked=self.blocking)
+
+        def on_finished(params):
+            weight.bytes += params.get("encodedDataLength", 0)
+            weight.requests += 1
+
+        def on_failed(params):
+            if params.get("blockedReason") or "BLOCKED_BY_CLIENT" in params.get("errorText", ""):
+                resource_type = params.get("type", "Other")
+                weight.blocked[resource_type] = weight.blocked.get(resource_type, 0) + 1
+
+        def on_load(params):
+            if weight.load_time is None:
+                weight.load_time = time.monotonic() - weight.started
+
+        handlers = {
+            "Network.loadingFinished": on_finished,
+            "Network.loadingFailed": on_failed,
+            "Page.loadEventFired": on_load,
+        }
+        for method, handler in handlers.items():
+            self.tab.on(method, handler)
+        try:
+            yield weight
+        finally:
+            for method, handler in handlers.items():
+                self.tab.off(method, handler)
+
+
+class PageWeight:
+    """What one page load cost"""
+
+    def __init__(self, blocked):
+        self.blocked_mode = blocked
+        self.started = time.monotonic()
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = {}
+        self.load_time = None
+
+    @property
+    def blocked_requests(self):
+        return sum(self.blocked.values())
+
+
+class WeightBaseline:
+    """Running average of unblocked profile loads, used to estimate what blocking saves"""
+
+    def __init__(self, every=BASELINE_EVERY, smoothing=BASELINE_SMOOTHING):
+        self.every = every
+        self.smoothing = smoothing
+        self.bytes = None
+        self.load_time = None
+        self._since = 0
+
+    def due(self):
+        """Whether the next profile load should run unblocked"""
+        if self.every <= 0:
+            return False
+        self._since += 1
+        if self._since >= self.every:
+            self._since = 0
+            return True
+        return False
+
+    def update(self, weight):
+        if weight.load_time is None:
+            return
+        if self.bytes is None:
+            self.bytes, self.load_time = weight.bytes, weight.load_time
+        else:
+            a = self.smoothing
+            self.bytes = (1 - a) * self.bytes + a * weight.bytes
+            self.load_time = (1 - a) * self.load_time + a * weight.load_time
+
+    def report(self, weight, timings=None):
+        """Record `weight` in metrics and `timings`, comparing it with the baseline"""
+        SCRAPE_PAGE_BYTES.inc(weight.bytes, kind="loaded")
+        for resource_type, count in weight.blocked.items():
+            SCRAPE_BLOCKED_REQUESTS.inc(count, type=resource_type)
+        if weight.load_time is not None:
+            observe_stage("page_load", weight.load_time)
+
+        if not weight.blocked_mode:
+            self.update(weight)
+
+        saved = delta = None
+        if weight.blocked_mode and self.bytes is not None:
+            saved = max(0, int(self.bytes - weight.bytes))
+            SCRAPE_PAGE_BYTES.inc(saved, kind="saved")
+            if weight.load_time is not None:
+                delta = round(weight.load_time - self.load_time, 3)
+
+        if timings is not None:
+            timings["page_bytes"] = weight.bytes
+            timings["page_blocked_requests"] = weight.blocked_requests
+            timings["page_bytes_saved"] = saved
+            if weight.load_time is not None:
+                timings["page_load"] = round(weight.load_time, 3)
+            timings["page_load_delta"] = delta
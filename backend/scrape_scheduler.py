@@ -0,0 +1,194 @@
+"""
+Admission control for scrape work
+
+Scrapes wait in priority lanes (interactive > batch > background) for one of a
+fixed number of browser slots, and every navigation takes a token from its
+domain's bucket so bursts don't get throttled by LinkedIn. Everything here runs
+on the scraper service's event loop and is not thread-safe.
+"""
+import os
+import time
+import heapq
+import asyncio
+import itertools
+from urllib.parse import urlsplit
+
+from metrics import SCRAPE_QUEUE_DEPTH, SCRAPE_REJECTED
+
+# Priority lanes, highest first
+LANES = ("interactive", "batch", "background")
+
+# Scrapes allowed to wait in each lane before new ones are rejected
+MAX_QUEUED_PER_LANE = int(os.environ.get("SCRAPE_MAX_QUEUED", "50"))
+
+# Navigations per second per domain and how many may go out back to back
+# (SCRAPE_NAV_RATE=0 disables rate limiting)
+NAVIGATIONS_PER_SECOND = float(os.environ.get("SCRAPE_NAV_RATE", "0.5"))
+NAVIGATION_BURST = int(os.environ.get("SCRAPE_NAV_BURST", "3"))
+
+
+class ScrapeQueueFull(Exception):
+    """Raised immediately when a lane already holds its maximum of waiting scrapes"""
+
+
+class TokenBucket:
+    """Classic token bucket; waiters reserve a token up front so they are served in order"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    async def take(self):
+        """Wait for one token and return the seconds spent waiting"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+
+        delay = -self.tokens / self.rate
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Hand the reservation back to the callers behind us
+            self.tokens += 1
+            raise
+        return delay
+
+
+class DomainRateLimiter:
+    """One token bucket per domain (www. and bare hosts share a bucket)"""
+
+    def __init__(self, rate=NAVIGATIONS_PER_SECOND, burst=NAVIGATION_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+
+    async def wait(self, url):
+        """Wait until a navigation to `url` is allowed; returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        host = (urlsplit(url).hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return await bucket.take()
+
+
+class Ticket:
+    """A scrape's place in the scheduler: queued -> granted -> released, or cancelled"""
+
+    def __init__(self, lane, future=None):
+        self.lane = lane
+        self.rank = LANES.index(lane)
+        self.future = future
+        self.state = "queued" if future is not None else "granted"
+
+
+class PriorityScheduler:
+    """
+    Grants at most `slots` concurrent scrapes, highest lane first, FIFO within a lane
+
+    A lane that already has `max_queued` scrapes waiting rejects new ones with
+    ScrapeQueueFull instead of letting the wait grow without bound.
+    """
+
+    def __init__(self, slots, max_queued=MAX_QUEUED_PER_LANE):
+        self.slots = slots
+        self.max_queued = max_queued
+        self._busy = 0
+        self._paused = False
+        self._heap = []
+        self._seq = itertools.count()
+        self._queued = {lane: 0 for lane in LANES}
+
+    @property
+    def busy(self):
+        """Slots currently granted"""
+        return self._busy
+
+    def pause(self):
+        """Stop granting slots; new scrapes queue up (e.g. while Chrome restarts)"""
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._grant_next()
+
+    def queued(self, lane=None):
+        return self._queued[lane] if lane else sum(self._queued.values())
+
+    def is_full(self, lane):
+        """Whether a new scrape in `lane` would be rejected right now"""
+        # Scrapes only wait while every slot is busy (or granting is paused)
+        return self._queued[lane] >= self.max_queued
+
+    def enqueue(self, lane):
+        """
+        Take a slot now or a place in `lane`'s queue; await `wait(ticket)` before scraping
+
+        Raises:
+            ValueError: for an unknown lane
+            ScrapeQueueFull: if the lane is full
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown scrape lane {lane!r}, expected one of {', '.join(LANES)}")
+        if self._busy < self.slots and not self.queued() and not self._paused:
+            self._busy += 1
+            return Ticket(lane)
+        if self._queued[lane] >= self.max_queued:
+            SCRAPE_REJECTED.inc(lane=lane)
+            raise ScrapeQueueFull(f"{self._queued[lane]} {lane} scrapes already waiting, try again later")
+
+        ticket = Ticket(lane, asyncio.get_running_loop().create_future())
+        self._push(ticket)
+        self._set_queued(lane, 1)
+        return ticket
+
+    async def wait(self, ticket):
+        """Wait until `ticket` is granted a slot"""
+        if ticket.state == "queued":
+            await asyncio.shield(ticket.future)
+
+    def promote(self, ticket, lane):
+        """Move a still-waiting ticket up to a higher lane (e.g. a submit joined a queued refresh)"""
+        if ticket.state != "queued" or LANES.index(lane) >= ticket.rank:
+            return
+        self._set_queued(ticket.lane, -1)
+        ticket.lane = lane
+        ticket.rank = LANES.index(lane)
+        self._set_queued(lane, 1)
+        # The old heap entry is skipped once its rank no longer matches
+        self._push(ticket)
+
+    def discard(self, ticket):
+        """Give back a granted slot or drop a queued ticket; safe to call more than once"""
+        if ticket.state == "granted":
+            ticket.state = "released"
+            self._busy -= 1
+            self._grant_next()
+        elif ticket.state == "queued":
+            ticket.state = "cancelled"
+            self._set_queued(ticket.lane, -1)
+
+    def _push(self, ticket):
+        heapq.heappush(self._heap, (ticket.rank, next(self._seq), ticket))
+
+    def _set_queued(self, lane, delta):
+        self._queued[lane] += delta
+        SCRAPE_QUEUE_DEPTH.inc(delta, lane=lane)
+
+    def _grant_next(self):
+        while self._busy < self.slots and self._heap and not self._paused:
+            rank, _, ticket = heapq.heappop(self._heap)
+            if ticket.state != "queued" or rank != ticket.rank:
+                continue
+            ticket.state = "granted"
+            self._set_queued(ticket.lane, -1)
+            self._busy += 1
+            ticket.future.set_result(None)
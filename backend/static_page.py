@@ -0,0 +1,73 @@
+import os
+import gzip
+import hashlib
+import threading
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is served without it
+    brotli = None
+
+# How long browsers may reuse the page before revalidating (seconds)
+PAGE_MAX_AGE = int(os.environ.get("DASHBOARD_MAX_AGE", "300"))
+
+
+class StaticPage:
+    """
+    A page rendered once and kept as identity, gzip and (optionally) brotli
+    bodies, each with its own strong ETag
+
+    Conditional requests are answered with 304 from the stored ETags without
+    touching the body or the template.
+    """
+
+    def __init__(self, body, content_type="text/html; charset=utf-8", max_age=PAGE_MAX_AGE):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.content_type = content_type
+        self.max_age = max_age
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {"identity": (body, f'"{digest}"')}
+        self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gz"')
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+    def _choose_encoding(self, request):
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and request.accept_encodings[encoding] > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request):
+        encoding = self._choose_encoding(request)
+        body, etag = self.variants[encoding]
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if request.if_none_match.contains_weak(etag.strip('"')):
+            return Response(status=304, headers=headers)
+        return Response(body, content_type=self.content_type, headers=headers)
+
+
+class LazyStaticPage:
+    """Builds the StaticPage on first use (e.g. when an app context is available)"""
+
+    def __init__(self, render):
+        self._render = render
+        self._page = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._page is None:
+            with self._lock:
+                if self._page is None:
+                    self._page = StaticPage(self._render())
+        return self._page
@@ -0,0 +1,21 @@
+import pytest
+
+from profile_cache import canonicalize_linkedin_url
+
+
+@pytest.mark.parametrize("url", [
+    "linkedin.com/in/Jane-Doe",
+    "https://pk.linkedin.com/in/jane-doe/",
+    "https://www.linkedin.com/in/jane-doe/?trk=abc#top",
+    "https://www.linkedin.com/in/jane-doe/details/experience/",
+])
+def test_in_urls_collapse_to_the_profile(url):
+    assert canonicalize_linkedin_url(url) == "https://www.linkedin.com/in/jane-doe"
+
+
+def test_legacy_pub_urls_keep_their_full_path():
+    first = canonicalize_linkedin_url("https://www.linkedin.com/pub/john-doe/12/345/678")
+    second = canonicalize_linkedin_url("https://uk.linkedin.com/pub/john-doe/98/765/432/")
+
+    assert first == "https://www.linkedin.com/pub/john-doe/12/345/678"
+    assert second == "https://www.linkedin.com/pub/john-doe/98/765/432"
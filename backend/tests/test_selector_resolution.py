@@ -0,0 +1,95 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import automate_chrome
+from automation_stats import SelectorCache, target_key
+
+SPECIFIC = 'textarea[data-testid="system-prompt-textarea"]'
+
+# Runs the resolver script against a fake DOM: `present` selectors match from
+# the start, `appears` ([ms, selector]) are added later and fire the observers
+FAKE_PAGE = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const present = new Set(input.present);
+const observers = [];
+global.document = {
+    documentElement: {},
+    querySelector: (s) => present.has(s) ? { selector: s, disabled: false, getClientRects: () => [1] } : null,
+};
+global.MutationObserver = class {
+    constructor(callback) { this.callback = callback; this.active = false; }
+    observe() { this.active = true; observers.push(this); }
+    disconnect() { this.active = false; }
+};
+input.appears.forEach(([ms, selector]) => setTimeout(() => {
+    present.add(selector);
+    observers.filter((o) => o.active).forEach((o) => o.callback([]));
+}, ms));
+new Function(input.script).apply(null, input.args.concat([(result) => {
+    console.log(JSON.stringify([result[0], result[1] && result[1].selector]));
+    process.exit(0);
+}]));
+"""
+
+
+class FakeDriver:
+    def __init__(self, present, appears=()):
+        self.present = present
+        self.appears = appears
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, *args):
+        payload = json.dumps({"script": script, "args": list(args), "present": self.present, "appears": self.appears})
+        out = subprocess.run(["node", "-e", FAKE_PAGE], input=payload, capture_output=True, text=True, timeout=30)
+        return json.loads(out.stdout)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SelectorCache(str(tmp_path / "selector_cache.json"))
+    monkeypatch.setattr(automate_chrome, "get_selector_cache", lambda: cache)
+    return cache
+
+
+def resolve(driver, timeout):
+    return automate_chrome.resolve_element(
+        driver, automate_chrome.DASHBOARD_URL, automate_chrome.TEXTAREA_SELECTORS,
+        timeout=timeout, fallbacks=automate_chrome.TEXTAREA_FALLBACK_SELECTORS
+    )
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+def test_generic_match_waits_for_the_specific_selector(cache):
+    driver = FakeDriver(present=["textarea"], appears=[[50, SPECIFIC]])
+
+    assert resolve(driver, timeout=5) == SPECIFIC
+
+    entry = cache.snapshot()[target_key(automate_chrome.DASHBOARD_URL)]
+    assert entry["preferred"] == SPECIFIC
+    assert cache.order(automate_chrome.DASHBOARD_URL, automate_chrome.TEXTAREA_SELECTORS)[0] == SPECIFIC
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+def test_fallback_is_used_after_the_timeout_but_never_learned(cache):
+    driver = FakeDriver(present=["textarea"])
+
+    assert resolve(driver, timeout=0.2) == "textarea"
+
+    entry = cache.snapshot()[target_key(automate_chrome.DASHBOARD_URL)]
+    assert entry["preferred"] is None
+    assert entry["fallbacks"] == 1
+    assert "textarea" not in entry["selectors"]
+    assert cache.order(automate_chrome.DASHBOARD_URL, automate_chrome.TEXTAREA_SELECTORS) == automate_chrome.TEXTAREA_SELECTORS
+
+
+def test_learned_generic_selector_from_an_old_cache_is_ignored(cache):
+    cache.record(automate_chrome.DASHBOARD_URL, "textarea", 10.0)
+
+    ordered = cache.order(automate_chrome.DASHBOARD_URL, automate_chrome.TEXTAREA_SELECTORS)
+
+    assert ordered == automate_chrome.TEXTAREA_SELECTORS
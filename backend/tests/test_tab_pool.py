@@ -0,0 +1,100 @@
+import asyncio
+import itertools
+
+import pytest
+
+import linkedin_scraper
+from linkedin_scraper import ScraperService, TabLeaseTimeout
+
+
+class FakeTab:
+    def __init__(self, target_id):
+        self.id = target_id
+
+    async def send(self, method, _timeout=None, **params):
+        # No loaderId: the navigation watcher has nothing to wait for
+        return {}
+
+    def on(self, method, callback):
+        pass
+
+    def off(self, method, callback):
+        pass
+
+
+class FakeBrowser:
+    ids = itertools.count()
+    opened = []
+    closed = []
+
+    def __init__(self, debug_url):
+        self.connected = False
+
+    async def connect(self):
+        self.connected = True
+
+    async def send(self, method, _timeout=None, **params):
+        return {}
+
+    async def new_tab(self):
+        tab = FakeTab(f"T{next(self.ids)}")
+        self.opened.append(tab.id)
+        return tab
+
+    async def close_tab(self, tab):
+        self.closed.append(tab.id)
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeBlocker:
+    def __init__(self, tab):
+        pass
+
+    async def install(self):
+        pass
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(linkedin_scraper, "CDPBrowser", FakeBrowser)
+    monkeypatch.setattr(linkedin_scraper, "TabBlocker", FakeBlocker)
+    FakeBrowser.opened, FakeBrowser.closed = [], []
+    service = ScraperService(pool_size=1)
+    yield service
+    service.loop.call_soon_threadsafe(service.loop.stop)
+
+
+def test_reconnect_while_a_tab_is_leased_keeps_the_pool_size(service):
+    async def scenario():
+        async with service.lease(timeout=1) as old:
+            # The connection drops mid-scrape and the next caller reconnects
+            service._browser.connected = False
+            await service._get_browser()
+            assert service._open == 0
+        assert service._open == 0
+        assert old.tab.id in FakeBrowser.closed
+
+        async with service.lease(timeout=1):
+            assert service._open == 1
+            with pytest.raises(TabLeaseTimeout):
+                async with service.lease(timeout=0.2):
+                    pass
+        assert service._open == 1
+
+    service.run(scenario(), timeout=10)
+    assert len(FakeBrowser.opened) == 2
+
+
+def test_tab_released_after_a_restart_is_not_pooled(service):
+    async def scenario():
+        async with service.lease(timeout=1) as old:
+            await service._drop_browser()
+            await service._get_browser()
+        assert service._open == 0
+        assert service._idle.empty()
+        return old
+
+    old = service.run(scenario(), timeout=10)
+    assert old.tab.id not in service.pool_target_ids()
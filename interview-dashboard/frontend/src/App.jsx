@@ -1,3 +1,50 @@
+const API_BASE = 'http://127.0.0.1:5000';
+
+// Poll a queued job until it finishes
+const pollJob = async (jobUrl) => {
+  let job;
+  do {
+    await new Promise(resolve => setTimeout(resolve, 1000));
+    job = await (await fetch(`${API_BASE}${jobUrl}`)).json();
+    console.log("🔵 Job status:", job.status, job.stage);
+  } while (job.status !== 'success' && job.status !== 'error');
+  return job;
+};
+
+// Stream a queued job's stage events (partial profile, elapsed time) over SSE,
+// falling back to polling if the stream can't be used
+const followJob = (queued, onProgress = (event) => console.log(`🔵 ${event.event} at ${event.elapsed}s`, event.data)) => {
+  if (!window.EventSource || !queued.events_url) {
+    return pollJob(queued.job_url);
+  }
+  return new Promise((resolve) => {
+    const source = new EventSource(`${API_BASE}${queued.events_url}`);
+    let finished = false;
+    const finish = (job) => {
+      finished = true;
+      source.close();
+      resolve(job);
+    };
+
+    ['scrape_started', 'profile_basics', 'experiences', 'education', 'skills', 'prompt_formatted',
+     'automation_dispatched', 'paste_confirmed', 'paste_failed'].forEach((name) => {
+      source.addEventListener(name, (e) => onProgress(JSON.parse(e.data)));
+    });
+    source.addEventListener('done', (e) => {
+      finish({ status: 'success', result: JSON.parse(e.data).data.result });
+    });
+    source.addEventListener('error', (e) => {
+      if (e.data) {
+        finish({ status: 'error', error: JSON.parse(e.data).data.message });
+      } else if (!finished) {
+        finished = true;
+        source.close();
+        resolve(pollJob(queued.job_url));
+      }
+    });
+  });
+};
+
 const handleSubmit = async (e) => {
   e.preventDefault();
   
@@ -12,7 +59,7 @@ const handleSubmit = async (e) => {
   try {
     console.log("🔵 Sending request to server...");
     
-    const response = await fetch('http://127.0.0.1:5000/submit', {
+    const response = await fetch(`${API_BASE}/submit`, {
       method: 'POST',
       headers: { 
         'Content-Type': 'application/json',
@@ -25,8 +72,14 @@ const handleSubmit = async (e) => {
     
     console.log("🔵 Response status:", response.status);
     
-    const data = await response.json();
+    let data = await response.json();
     console.log("🔵 Server response:", data);
+
+    // Interview setup runs as a background job; follow its progress events
+    if (data.status === 'queued') {
+      const job = await followJob(data);
+      data = { status: job.status, message: job.error, ...job.result };
+    }
     
     if (data.status === 'success') {
       console.log("✅ LinkedIn URL sent successfully!");